@@ -16,6 +16,7 @@ Date: 2025-12-05
 import os
 import asyncio
 import logging
+import threading
 from pathlib import Path
 from typing import Optional
 import subprocess
@@ -63,6 +64,10 @@ DEFAULT_VOICE_PROFILE = 'warm_grandfather'
 class TTSGenerator:
     """Generates TTS audio using Microsoft Edge TTS."""
 
+    # Output directories already created by any generator in this process
+    _ensured_dirs: set = set()
+    _ensured_dirs_lock = threading.Lock()
+
     def __init__(self):
         """Initialize TTS generator."""
         self.voice_profiles = VOICE_PROFILES
@@ -86,6 +91,22 @@ class TTSGenerator:
 
         return config
 
+    def _ensure_output_dir(self, output_path: Path):
+        """
+        Create the parent directory of output_path once per process.
+
+        Args:
+            output_path: Path of the file about to be written
+        """
+        parent = str(output_path.parent)
+        if parent in self._ensured_dirs:
+            return
+
+        with self._ensured_dirs_lock:
+            if parent not in self._ensured_dirs:
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                self._ensured_dirs.add(parent)
+
     async def generate_audio_async(self, text: str, output_path: Path,
                                    voice_config: dict) -> bool:
         """
@@ -109,9 +130,9 @@ class TTSGenerator:
             )
 
             # Ensure output directory exists
-            output_path.parent.mkdir(parents=True, exist_ok=True)
+            self._ensure_output_dir(output_path)
 
-            # Generate and save audio
+            # Generate and save audio (Edge TTS already returns mono MP3)
             await communicate.save(str(output_path))
 
             # Verify file exists and has content
@@ -173,6 +194,20 @@ class TTSGenerator:
             logger.error(f"Error getting audio duration: {e}")
             return None
 
+    def estimate_duration(self, text: str) -> float:
+        """
+        Estimate narration duration at the default speech rate.
+
+        Args:
+            text: Text to synthesize
+
+        Returns:
+            Estimated duration in seconds
+        """
+        # Estimate speech rate (rough approximation)
+        # Average Russian speech: ~4-5 characters per second
+        return len(text) / 4.5
+
     def adjust_speed_for_duration(self, text: str, target_duration: float,
                                   voice_config: dict, tolerance: float = 2.0) -> dict:
         """
@@ -190,9 +225,7 @@ class TTSGenerator:
         Returns:
             Adjusted voice configuration
         """
-        # Estimate speech rate (rough approximation)
-        # Average Russian speech: ~4-5 characters per second
-        estimated_duration = len(text) / 4.5
+        estimated_duration = self.estimate_duration(text)
 
         if abs(estimated_duration - target_duration) <= tolerance:
             # Already close enough
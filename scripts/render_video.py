@@ -14,41 +14,483 @@ Date: 2025-12-05
 """
 
 import os
+import sys
+import atexit
+import errno
+import json
+import shutil
+import warnings
+import uuid
+import hashlib
+import tempfile
+import functools
 import subprocess
 import logging
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
 # Configure logging
 logger = logging.getLogger('VideoRenderer')
 
+# Device node used for VAAPI hardware encoding on Linux
+VAAPI_DEVICE = '/dev/dri/renderD128'
+
+# Fonts used for the watermark (Roboto covers Cyrillic)
+FONTS_DIR = Path(__file__).parent.parent / 'assets' / 'fonts'
+
+# Conservative upper bound on encoded output size (~8 Mbit/s), used to decide
+# whether a render fits in the scratch directory
+STAGING_BYTES_PER_SECOND = 1024 * 1024
+
+# Free space left in the scratch directory for everything else, e.g.
+# concurrent render_many workers
+STAGING_HEADROOM = 256 * 1024 * 1024
+
+# Text watermark appearance (bottom-left, semi-transparent white)
+WATERMARK_FONT = 'Roboto-Regular.ttf'
+WATERMARK_FONT_SIZE = 24
+WATERMARK_FILL = (255, 255, 255, 128)
+WATERMARK_MARGIN = 10
+
+
+class RenderJob(NamedTuple):
+    """One reel to render: collage, narration and output path."""
+    image_path: Path
+    audio_path: Path
+    output_path: Path
+
+
+@functools.lru_cache(maxsize=1)
+def _ffmpeg_available() -> bool:
+    """Check if FFmpeg is installed (cached for the process)."""
+    try:
+        subprocess.run(['ffmpeg', '-version'], capture_output=True, check=True)
+        return True
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return False
+
+
+class AudioInfo(NamedTuple):
+    """Duration and first audio stream parameters of a media file."""
+    duration: float
+    codec_name: Optional[str]
+    sample_rate: int
+    channels: int
+
+
+@functools.lru_cache(maxsize=64)
+def _probe_audio(path: str, mtime_ns: int, size: int) -> AudioInfo:
+    """
+    Read a media file's duration and audio stream parameters with one ffprobe call.
+
+    Cached on (path, mtime, size), so rewriting the file invalidates the entry.
+
+    Raises:
+        subprocess.CalledProcessError, ValueError, KeyError, FileNotFoundError
+    """
+    cmd = [
+        'ffprobe',
+        '-v', 'error',
+        '-select_streams', 'a:0',
+        '-show_entries', 'format=duration:stream=codec_name,sample_rate,channels',
+        '-of', 'json',
+        path
+    ]
+
+    result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    info = json.loads(result.stdout)
+    stream = (info.get('streams') or [{}])[0]
+
+    return AudioInfo(
+        duration=float(info['format']['duration']),
+        codec_name=stream.get('codec_name'),
+        sample_rate=int(stream.get('sample_rate', 0)),
+        channels=int(stream.get('channels', 0)),
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def _read_image_size(path: str, mtime_ns: int, size: int) -> Tuple[int, int]:
+    """
+    Read an image's dimensions from its header (pixel data is not decoded).
+
+    Cached on (path, mtime, size), so rewriting the file invalidates the entry.
+
+    Raises:
+        OSError if the file is missing or not a readable image
+    """
+    from PIL import Image
+
+    with Image.open(path) as img:
+        return img.size
+
+
+@functools.lru_cache(maxsize=1)
+def _available_encoders() -> frozenset:
+    """List encoder names supported by the installed FFmpeg (cached)."""
+    try:
+        result = subprocess.run(['ffmpeg', '-hide_banner', '-encoders'],
+                                capture_output=True, text=True, timeout=10)
+    except (subprocess.TimeoutExpired, FileNotFoundError):
+        return frozenset()
+
+    # Encoder lines look like: " V....D libx264   libx264 H.264 / AVC ..."
+    encoders = set()
+    for line in result.stdout.splitlines():
+        parts = line.split()
+        if len(parts) >= 2 and len(parts[0]) == 6 and parts[0][0] in 'VAS':
+            encoders.add(parts[1])
+    return frozenset(encoders)
+
+
+def _encoder_works(codec: str) -> bool:
+    """
+    Encode a single test frame to check that a hardware encoder really runs.
+
+    Being listed by FFmpeg doesn't mean the driver, device or permissions
+    are in place (e.g. a missing VA driver or render group membership).
+
+    Args:
+        codec: FFmpeg encoder name
+
+    Returns:
+        True if the test encode succeeded
+    """
+    vaapi = codec == 'h264_vaapi'
+    cmd = [
+        'ffmpeg', '-hide_banner', '-loglevel', 'error',
+        *(['-init_hw_device', f"vaapi=va:{VAAPI_DEVICE}",
+           '-filter_hw_device', 'va'] if vaapi else []),
+        '-f', 'lavfi', '-i', 'color=black:s=256x256',
+        '-frames:v', '1',
+        *(['-vf', 'format=nv12,hwupload'] if vaapi else ['-pix_fmt', 'yuv420p']),
+        '-c:v', codec,
+        '-f', 'null', '-',
+    ]
+
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+    except (subprocess.TimeoutExpired, FileNotFoundError):
+        return False
+
+    if result.returncode != 0:
+        logger.warning(f"Encoder {codec} is listed but failed a test encode, skipping it")
+        return False
+    return True
+
+
+@functools.lru_cache(maxsize=1)
+def detect_video_codec() -> str:
+    """
+    Pick the fastest working H.264 encoder (cached).
+
+    Prefers VideoToolbox (macOS), NVENC (NVIDIA), then VAAPI (Intel/AMD),
+    falling back to libx264. Each hardware candidate must pass a one-frame
+    test encode.
+
+    Returns:
+        FFmpeg encoder name
+    """
+    encoders = _available_encoders()
+
+    candidates = []
+    if sys.platform == 'darwin' and 'h264_videotoolbox' in encoders:
+        candidates.append('h264_videotoolbox')
+    if 'h264_nvenc' in encoders and shutil.which('nvidia-smi'):
+        candidates.append('h264_nvenc')
+    if 'h264_vaapi' in encoders and os.path.exists(VAAPI_DEVICE):
+        candidates.append('h264_vaapi')
+
+    for codec in candidates:
+        if _encoder_works(codec):
+            return codec
+    return 'libx264'
+
+
+@functools.lru_cache(maxsize=1)
+def _scratch_dir() -> Path:
+    """Directory for short-lived render files, preferring RAM-backed /dev/shm."""
+    shm = Path('/dev/shm')
+    if shm.is_dir() and os.access(shm, os.W_OK):
+        return shm
+    return Path(tempfile.gettempdir())
+
+
+def _scratch_file(suffix: str) -> Path:
+    """Unique path in the scratch directory for one render's temporary file."""
+    return _scratch_dir() / f"folk_{os.getpid()}_{uuid.uuid4().hex}{suffix}"
+
+
+def _staging_file(output_path: Path, duration: float, reserved: float = 0) -> Path:
+    """
+    Temporary path FFmpeg writes one video to before it is published.
+
+    Uses the scratch directory when it has room for the encode (estimated
+    from the duration) plus STAGING_HEADROOM. Otherwise, e.g. with Docker's
+    64MB /dev/shm, it uses a hidden file next to output_path so publishing
+    is a rename on the same filesystem.
+
+    Args:
+        output_path: Final video path
+        duration: Video duration in seconds
+        reserved: Bytes already claimed in the scratch directory by other
+            outputs of the same FFmpeg run
+
+    Returns:
+        Staging path for the video
+    """
+    try:
+        free = shutil.disk_usage(_scratch_dir()).free
+    except OSError:
+        free = 0
+
+    if free - reserved - STAGING_HEADROOM >= duration * STAGING_BYTES_PER_SECOND:
+        return _scratch_file(output_path.suffix)
+    return output_path.with_name(f".{output_path.stem}.{uuid.uuid4().hex}{output_path.suffix}")
+
+
+def _escape_filter_path(path: Path) -> str:
+    """Escape a file path for use inside a quoted FFmpeg filter option."""
+    return path.as_posix().replace('\\', '\\\\').replace(':', '\\:').replace("'", "\\'")
+
+
+# Watermark PNGs rendered by this process, keyed by _watermark_key()
+_watermark_cache: Dict[str, Path] = {}
+_watermark_lock = threading.Lock()
+
+
+def _watermark_key(watermark_text: str) -> str:
+    """Cache key covering the watermark text and every style setting."""
+    style = f"{WATERMARK_FONT}|{WATERMARK_FONT_SIZE}|{WATERMARK_FILL}|{watermark_text}"
+    return hashlib.sha1(style.encode('utf-8')).hexdigest()
+
+
+def _watermark_image(watermark_text: str) -> Path:
+    """
+    Render a text watermark to a transparent PNG (cached per text and style).
+
+    The PNG is created with mkstemp (unpredictable name, owner-only
+    permissions) and only cached once fully written. A cached file that has
+    since been removed from the scratch directory is rendered again.
+
+    Args:
+        watermark_text: Text to display
+
+    Returns:
+        Path to the watermark PNG
+    """
+    key = _watermark_key(watermark_text)
+
+    with _watermark_lock:
+        png_path = _watermark_cache.get(key)
+        if png_path is not None and png_path.exists():
+            return png_path
+
+        from PIL import Image, ImageDraw, ImageFont
+
+        try:
+            font = ImageFont.truetype(str(FONTS_DIR / WATERMARK_FONT), WATERMARK_FONT_SIZE)
+        except OSError:
+            logger.warning(f"Font not found: {WATERMARK_FONT}, using default")
+            font = ImageFont.load_default()
+
+        left, top, right, bottom = font.getbbox(watermark_text)
+        image = Image.new('RGBA', (max(right - left, 1), max(bottom - top, 1)), (0, 0, 0, 0))
+        ImageDraw.Draw(image).text((-left, -top), watermark_text, font=font,
+                                   fill=WATERMARK_FILL)
+
+        fd, name = tempfile.mkstemp(prefix='folk_wm_', suffix='.png', dir=_scratch_dir())
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                image.save(f, format='PNG')
+        except Exception:
+            os.unlink(name)
+            raise
+
+        png_path = Path(name)
+        _watermark_cache[key] = png_path
+        return png_path
+
+
+def _remove_watermarks() -> None:
+    """Delete the watermark PNGs rendered by this process (registered with atexit)."""
+    with _watermark_lock:
+        for png_path in _watermark_cache.values():
+            try:
+                png_path.unlink()
+            except OSError:
+                pass
+        _watermark_cache.clear()
+
+
+atexit.register(_remove_watermarks)
+
+
+def _watermark_graph(head: str, watermark_text: str, tag: str = '') -> str:
+    """
+    Overlay a watermark PNG onto the output of a filter chain.
+
+    The PNG is loaded once by the movie source and repeated by overlay, so
+    no text is rasterized per frame.
+
+    Args:
+        head: Filter chain producing the base video
+        watermark_text: Text to display
+        tag: Suffix keeping link labels unique within one filter graph
+
+    Returns:
+        Filter graph whose open output is the watermarked video
+    """
+    png_path = _escape_filter_path(_watermark_image(watermark_text))
+
+    return (f"{head}[base{tag}];"
+            f"movie=filename='{png_path}'[wm{tag}];"
+            f"[base{tag}][wm{tag}]overlay=x={WATERMARK_MARGIN}:y=H-h-{WATERMARK_MARGIN}")
+
 
 class VideoRenderer:
-    """Renders videos using FFmpeg."""
+    """Renders videos using FFmpeg (or in-process via PyAV)."""
+
+    # Output directories already created by any renderer in this process
+    _ensured_dirs: set = set()
+    _ensured_dirs_lock = threading.Lock()
 
-    def __init__(self):
-        """Initialize video renderer."""
+    def __init__(self, backend: Optional[str] = None):
+        """
+        Initialize video renderer.
+
+        Args:
+            backend: 'ffmpeg' (subprocess, default) or 'pyav' (in-process)
+        """
         # Get video settings from environment or use defaults
         self.width = int(os.getenv('VIDEO_WIDTH', 1080))
         self.height = int(os.getenv('VIDEO_HEIGHT', 1920))
         self.fps = int(os.getenv('VIDEO_FPS', 30))
-        self.video_codec = os.getenv('VIDEO_CODEC', 'libx264')
+        self.video_codec = os.getenv('VIDEO_CODEC', 'auto')
         self.audio_codec = os.getenv('AUDIO_CODEC', 'aac')
+        self.preset = os.getenv('VIDEO_PRESET', 'faster')
+        self.tune = os.getenv('VIDEO_TUNE', 'stillimage')
+        self.threads = int(os.getenv('VIDEO_THREADS', os.cpu_count() or 0))
+        self.fade_duration = 0.5  # 0.5 second fades
+        self.backend = backend or os.getenv('VIDEO_BACKEND', 'ffmpeg')
+
+        if self.backend == 'pyav':
+            try:
+                import av  # noqa: F401
+            except ImportError:
+                logger.warning("PyAV not installed (pip install av), using FFmpeg backend")
+                self.backend = 'ffmpeg'
 
-        # Check if FFmpeg is available
-        if not self._check_ffmpeg():
-            raise RuntimeError("FFmpeg not found. Please install FFmpeg.")
+        if self.backend == 'pyav':
+            # Encoding happens in-process with PyAV's bundled libraries
+            if self.video_codec == 'auto':
+                self.video_codec = 'libx264'
+        else:
+            # Check if FFmpeg is available
+            if not self._check_ffmpeg():
+                raise RuntimeError("FFmpeg not found. Please install FFmpeg.")
 
-        logger.info("Video renderer initialized")
+            # Use a hardware encoder when one is available
+            if self.video_codec == 'auto':
+                self.video_codec = detect_video_codec()
+
+        # Filters that don't depend on the clip, formatted once
+        # Convert full-range RGB/JPEG to limited-range BT.709 YUV once, before
+        # frames are duplicated, instead of letting FFmpeg convert every frame
+        convert = ("in_range=full:out_range=tv:out_color_matrix=bt709:"
+                   "flags=fast_bilinear,format=yuv420p")
+        self._scale_filters = (
+            # Still image: fast_bilinear has no visible cost and scales quickest
+            f"scale={self.width}:{self.height}:force_original_aspect_ratio=decrease:"
+            f"{convert},"
+            f"pad={self.width}:{self.height}:(ow-iw)/2:(oh-ih)/2"  # Center pad
+        )
+        self._convert_filters = f"scale={convert}"
+        self._fade_in_filters = (
+            f"fps={self.fps},"
+            f"fade=t=in:st=0:d={self.fade_duration}"  # Fade in
+        )
+        self._fade_out_template = f"fade=t=out:st={{start}}:d={self.fade_duration}"
+        if self.video_codec == 'h264_vaapi':
+            # Upload finished frames to the GPU for encoding
+            self._fade_out_template += ",format=nv12,hwupload"
+
+        # Command-line runs that don't depend on the clip, built once
+        vaapi = self.video_codec == 'h264_vaapi'
+        self._global_argv = (
+            'ffmpeg',
+            '-y',  # Overwrite output file
+            '-loglevel', 'error',  # Only report problems
+            *(('-init_hw_device', f"vaapi=va:{VAAPI_DEVICE}",
+               '-filter_hw_device', 'va') if vaapi else ()),  # GPU device
+        )
+        self._video_argv = (
+            '-c:v', self.video_codec,  # Video codec
+            *(() if vaapi else ('-pix_fmt', 'yuv420p')),  # Pixel format for compatibility
+            '-color_primaries', 'bt709',  # Tag colors to match the conversion
+            '-color_trc', 'bt709',
+            '-colorspace', 'bt709',
+            '-color_range', 'tv',
+            *self._encoder_args(),  # Speed/quality settings
+        )
+        self._audio_argv = (
+            '-c:a', self.audio_codec,  # Audio codec
+            '-b:a', '96k',  # Audio bitrate (mono narration)
+            '-ar', '22050',  # Audio sample rate
+            '-ac', '1',  # Mono
+        )
+        self._mux_argv = (
+            '-shortest',  # End when shortest stream ends
+            '-movflags', '+faststart',  # Web optimization
+        )
+
+        logger.info(f"Video renderer initialized "
+                    f"(backend: {self.backend}, encoder: {self.video_codec})")
 
     def _check_ffmpeg(self) -> bool:
         """Check if FFmpeg is installed."""
-        try:
-            subprocess.run(['ffmpeg', '-version'], capture_output=True, check=True)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
+        if not _ffmpeg_available():
             logger.error("FFmpeg not found. Install with: brew install ffmpeg")
             return False
+        return True
+
+    def _ensure_output_dir(self, output_path: Path):
+        """
+        Create the parent directory of output_path once per process.
+
+        Args:
+            output_path: Path of the file about to be written
+        """
+        parent = str(output_path.parent)
+        if parent in self._ensured_dirs:
+            return
+
+        with self._ensured_dirs_lock:
+            if parent not in self._ensured_dirs:
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                self._ensured_dirs.add(parent)
+
+    def probe_audio(self, audio_path: Path) -> Optional[AudioInfo]:
+        """
+        Get duration and codec parameters of an audio file using ffprobe.
+
+        Args:
+            audio_path: Path to audio file
+
+        Returns:
+            AudioInfo or None if error
+        """
+        try:
+            stat = audio_path.stat()
+            return _probe_audio(str(audio_path), stat.st_mtime_ns, stat.st_size)
+
+        except (subprocess.CalledProcessError, ValueError, KeyError,
+                FileNotFoundError) as e:
+            logger.error(f"Error probing audio: {e}")
+            return None
 
     def get_audio_duration(self, audio_path: Path) -> Optional[float]:
         """
@@ -60,25 +502,34 @@ class VideoRenderer:
         Returns:
             Duration in seconds or None if error
         """
-        try:
-            cmd = [
-                'ffprobe',
-                '-v', 'error',
-                '-show_entries', 'format=duration',
-                '-of', 'default=noprint_wrappers=1:nokey=1',
-                str(audio_path)
-            ]
+        info = self.probe_audio(audio_path)
+        return info.duration if info else None
+
+    def get_image_size(self, image_path: Path) -> Optional[Tuple[int, int]]:
+        """
+        Get dimensions of an image file.
 
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            duration = float(result.stdout.strip())
-            return duration
+        Args:
+            image_path: Path to image file
 
-        except (subprocess.CalledProcessError, ValueError, FileNotFoundError) as e:
-            logger.error(f"Error getting audio duration: {e}")
+        Returns:
+            (width, height) or None if unknown
+        """
+        try:
+            stat = image_path.stat()
+            return _read_image_size(str(image_path), stat.st_mtime_ns, stat.st_size)
+
+        except (OSError, ImportError) as e:
+            logger.debug(f"Could not read image size: {e}")
             return None
 
+    def _can_copy_audio(self, info: AudioInfo) -> bool:
+        """Whether the input audio already matches the output encoding."""
+        return (self.audio_codec == 'aac' == info.codec_name
+                and info.sample_rate == 22050 and info.channels == 1)
+
     def render_video(self, image_path: Path, audio_path: Path,
-                    output_path: Path) -> bool:
+                    output_path: Path, watermark_text: Optional[str] = None) -> bool:
         """
         Render video from image and audio using FFmpeg.
 
@@ -86,110 +537,480 @@ class VideoRenderer:
         1. Get audio duration
         2. Create video from static image (loop for audio duration)
         3. Add audio track
-        4. Apply fade in/out effects
+        4. Apply watermark and fade in/out effects
         5. Encode with Instagram-optimized settings
 
         Args:
             image_path: Path to collage image
             audio_path: Path to audio file
             output_path: Path to save output video
+            watermark_text: Optional text watermark burned in during the encode
 
         Returns:
             True if successful, False otherwise
         """
+        staging_path = None
+
         try:
-            # Get audio duration
-            duration = self.get_audio_duration(audio_path)
-            if not duration:
+            # PyAV path has no text rendering, so overlays go through FFmpeg
+            if self.backend == 'pyav' and not watermark_text:
+                return self._render_video_pyav(image_path, audio_path, output_path)
+
+            # Get audio duration and codec
+            info = self.probe_audio(audio_path)
+            if not info or not info.duration:
                 logger.error("Could not determine audio duration")
                 return False
 
+            duration = info.duration
+
             logger.info(f"Rendering video (duration: {duration:.2f}s)...")
 
             # Ensure output directory exists
-            output_path.parent.mkdir(parents=True, exist_ok=True)
+            self._ensure_output_dir(output_path)
+
+            # Encode to scratch when it has room so the +faststart rewrite stays off the output disk
+            staging_path = _staging_file(output_path, duration)
 
             # Build FFmpeg command
             # This creates a video from a static image with audio
-            cmd = [
-                'ffmpeg',
-                '-y',  # Overwrite output file
-                '-loop', '1',  # Loop the image
-                '-i', str(image_path),  # Input image
-                '-i', str(audio_path),  # Input audio
-                '-c:v', self.video_codec,  # Video codec
-                '-t', str(duration),  # Duration matches audio
-                '-pix_fmt', 'yuv420p',  # Pixel format for compatibility
-                '-c:a', self.audio_codec,  # Audio codec
-                '-b:a', '192k',  # Audio bitrate
-                '-ar', '44100',  # Audio sample rate
-                '-vf', self._build_video_filters(duration),  # Video filters
-                '-shortest',  # End when shortest stream ends
-                '-movflags', '+faststart',  # Web optimization
-                '-preset', 'medium',  # Encoding speed/quality balance
-                '-crf', '23',  # Quality (lower = better, 18-28 recommended)
-                str(output_path)
-            ]
+            cmd = self._build_command(image_path, ['-i', str(audio_path)],
+                                      duration, staging_path, watermark_text,
+                                      copy_audio=self._can_copy_audio(info))
 
             # Run FFmpeg
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=120  # 2 minute timeout
-            )
-
-            if result.returncode != 0:
-                logger.error(f"FFmpeg failed: {result.stderr}")
+            if not self._run_ffmpeg(cmd, timeout=self._render_timeout(duration)):
                 return False
 
-            # Verify output file
-            if output_path.exists() and output_path.stat().st_size > 0:
-                size_mb = output_path.stat().st_size / (1024 * 1024)
-                logger.info(f"✓ Video rendered: {output_path.name} ({size_mb:.2f} MB)")
-                return True
-            else:
-                logger.error("Output video is missing or empty")
-                return False
+            return self._publish_output(staging_path, output_path)
 
-        except subprocess.TimeoutExpired:
-            logger.error("FFmpeg timeout (>2 minutes)")
+        except subprocess.TimeoutExpired as e:
+            logger.error(f"FFmpeg timeout (>{e.timeout:.0f}s)")
             return False
         except Exception as e:
             logger.error(f"Video rendering failed: {e}", exc_info=True)
             return False
+        finally:
+            if staging_path:
+                staging_path.unlink(missing_ok=True)
+
+    def render_batch(self, jobs: List[RenderJob],
+                     watermark_text: Optional[str] = None) -> List[bool]:
+        """
+        Render several reels with a single FFmpeg invocation.
+
+        Each job gets its own branch in one -filter_complex graph and its own
+        output file, so FFmpeg startup is paid once for the whole batch.
+
+        Args:
+            jobs: Reels to render (RenderJob or equivalent tuples)
+            watermark_text: Optional text watermark applied to every reel
+
+        Returns:
+            Per-job success flags, in the order of jobs
+        """
+        jobs = [RenderJob(*job) for job in jobs]
+        if not jobs:
+            return []
+
+        staging_paths = []
+
+        try:
+            infos = [self.probe_audio(job.audio_path) for job in jobs]
+            if not all(info and info.duration for info in infos):
+                logger.error("Could not determine audio duration for every job")
+                return [False] * len(jobs)
+
+            # All outputs are written at once, so each one's share of the
+            # scratch directory counts against the next
+            reserved = 0
+            for job, info in zip(jobs, infos):
+                staging_paths.append(_staging_file(job.output_path, info.duration, reserved))
+                if staging_paths[-1].parent == _scratch_dir():
+                    reserved += info.duration * STAGING_BYTES_PER_SECOND
+
+            logger.info(f"Rendering batch of {len(jobs)} videos...")
+
+            inputs = []
+            branches = []
+            outputs = []
+
+            for k, (job, info, staging_path) in enumerate(zip(jobs, infos, staging_paths)):
+                duration = info.duration
+                self._ensure_output_dir(job.output_path)
+
+                # Inputs are numbered image, audio, image, audio, ...
+                inputs += self._image_input_args(job.image_path)
+                inputs += ['-i', str(job.audio_path)]
+
+                filters = self._build_video_filters(duration, watermark_text,
+                                                    self.get_image_size(job.image_path),
+                                                    tag=str(k))
+                branches.append(f"[{2 * k}:v]{filters}[v{k}]")
+
+                outputs += ['-map', f"[v{k}]", '-map', f"{2 * k + 1}:a",
+                            *self._output_args(duration, self._can_copy_audio(info)),
+                            str(staging_path)]
+
+            cmd = [
+                *self._global_argv,
+                *inputs,
+                '-filter_complex', ';'.join(branches),
+                *outputs
+            ]
+
+            timeout = sum(self._render_timeout(info.duration) for info in infos)
+            if not self._run_ffmpeg(cmd, timeout=timeout):
+                return [False] * len(jobs)
+
+            return [self._publish_output(staging_path, job.output_path)
+                    for job, staging_path in zip(jobs, staging_paths)]
+
+        except subprocess.TimeoutExpired:
+            logger.error("FFmpeg timeout while rendering batch")
+            return [False] * len(jobs)
+        except Exception as e:
+            logger.error(f"Batch rendering failed: {e}", exc_info=True)
+            return [False] * len(jobs)
+        finally:
+            for path in staging_paths:
+                path.unlink(missing_ok=True)
+
+    def _render_video_pyav(self, image_path: Path, audio_path: Path,
+                           output_path: Path) -> bool:
+        """
+        Render video in-process with PyAV instead of spawning FFmpeg.
+
+        The collage is fitted and padded once with Pillow and converted to
+        YUV once; only fade frames are recomputed. Audio is decoded and
+        re-encoded to mono narration settings.
+
+        Args:
+            image_path: Path to collage image
+            audio_path: Path to audio file
+            output_path: Path to save output video
+
+        Returns:
+            True if successful, False otherwise
+        """
+        import av
+        import numpy as np
+        from PIL import Image, ImageOps
+
+        self._ensure_output_dir(output_path)
+
+        # Same result as the scale/pad filters: fit inside, center on black
+        with Image.open(image_path) as img:
+            canvas = ImageOps.pad(img.convert('RGB'), (self.width, self.height),
+                                  color=(0, 0, 0))
+        pixels = np.asarray(canvas)
+
+        with av.open(str(audio_path)) as audio_in:
+            if audio_in.duration is None:
+                logger.error("Could not determine audio duration")
+                return False
+
+            duration = audio_in.duration / av.time_base
+            logger.info(f"Rendering video with PyAV (duration: {duration:.2f}s)...")
+
+            # Stage like the FFmpeg paths so a failed render never
+            # replaces a previous video at output_path
+            staging_path = _staging_file(output_path, duration)
+
+            try:
+                self._encode_pyav(audio_in, pixels, duration, staging_path)
+                return self._publish_output(staging_path, output_path)
+            finally:
+                staging_path.unlink(missing_ok=True)
+
+    def _encode_pyav(self, audio_in, pixels, duration: float, output_path: Path):
+        """
+        Encode the still image and narration into an MP4 with PyAV.
+
+        Args:
+            audio_in: Open PyAV input container with the narration
+            pixels: Fitted collage as an RGB numpy array
+            duration: Video duration in seconds
+            output_path: Path to write the video to
+        """
+        import av
+        import numpy as np
+
+        with av.open(str(output_path), 'w', options={'movflags': '+faststart'}) as output:
+            video_stream = output.add_stream(self.video_codec, rate=self.fps)
+            video_stream.width = self.width
+            video_stream.height = self.height
+            video_stream.pix_fmt = 'yuv420p'
+            video_stream.thread_count = self.threads
+            if not self.video_codec.startswith('h264_'):
+                video_stream.options = {'preset': self.preset, 'crf': '23',
+                                        **({'tune': self.tune} if self.tune else {})}
+
+            audio_stream = output.add_stream(self.audio_codec, rate=22050)
+            audio_stream.layout = 'mono'
+            audio_stream.bit_rate = 96000
+
+            # Convert the still image to YUV once and reuse it between fades
+            still = av.VideoFrame.from_ndarray(pixels, format='rgb24').reformat(format='yuv420p')
+            total_frames = int(round(duration * self.fps))
+            fade_frames = max(1, int(round(self.fade_duration * self.fps)))
+
+            for index in range(total_frames):
+                level = min(1.0, (index + 1) / fade_frames, (total_frames - index) / fade_frames)
+                if level < 1.0:
+                    frame = av.VideoFrame.from_ndarray(
+                        (pixels * level).astype(np.uint8), format='rgb24'
+                    ).reformat(format='yuv420p')
+                else:
+                    frame = still
+                frame.pts = index
+                output.mux(video_stream.encode(frame))
+            output.mux(video_stream.encode(None))
+
+            resampler = av.AudioResampler(format=audio_stream.format.name,
+                                          layout='mono', rate=22050)
+            for frame in audio_in.decode(audio=0):
+                frame.pts = None
+                for resampled in resampler.resample(frame):
+                    output.mux(audio_stream.encode(resampled))
+            for resampled in resampler.resample(None):
+                output.mux(audio_stream.encode(resampled))
+            output.mux(audio_stream.encode(None))
+
+    def _render_timeout(self, duration: float) -> int:
+        """
+        Seconds to allow FFmpeg for encoding a clip of the given length.
+
+        libx264 on a slow core can run well below real time, so the budget
+        grows with the clip; hardware encoders get a tighter bound.
+
+        Args:
+            duration: Video duration in seconds
+
+        Returns:
+            Timeout in seconds
+        """
+        if self.video_codec == 'libx264':
+            return max(60, int(duration * 8))
+        return max(30, int(duration * 2))
+
+    def _run_ffmpeg(self, cmd: List[str], timeout: float) -> bool:
+        """
+        Run FFmpeg, streaming its stderr to the debug log.
+
+        Args:
+            cmd: FFmpeg argument list
+            timeout: Seconds to wait before killing FFmpeg
+
+        Returns:
+            True if FFmpeg exited successfully, False otherwise
+
+        Raises:
+            subprocess.TimeoutExpired: If FFmpeg runs longer than timeout
+        """
+        process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            errors='replace'
+        )
+
+        # Keep only the tail of stderr for the error message
+        stderr_tail = deque(maxlen=20)
+
+        def drain_stderr():
+            for line in process.stderr:
+                line = line.rstrip()
+                logger.debug(f"ffmpeg: {line}")
+                stderr_tail.append(line)
+
+        reader = threading.Thread(target=drain_stderr, daemon=True)
+        reader.start()
+
+        try:
+            process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+            raise
+        finally:
+            reader.join()
+            process.stderr.close()
+
+        if process.returncode != 0:
+            logger.error("FFmpeg failed: " + '\n'.join(stderr_tail))
+            return False
+
+        return True
+
+    def _build_command(self, image_path: Path, audio_input: List[str],
+                       duration: float, output_path: Path,
+                       watermark_text: Optional[str] = None,
+                       copy_audio: bool = False) -> List[str]:
+        """
+        Build the FFmpeg command for a static image with an audio track.
+
+        Args:
+            image_path: Path to collage image
+            audio_input: FFmpeg input arguments for the audio track
+            duration: Video duration in seconds
+            output_path: Path to save output video
+            watermark_text: Optional text watermark
+            copy_audio: Stream-copy the audio track instead of re-encoding
+
+        Returns:
+            FFmpeg argument list
+        """
+        return [
+            *self._global_argv,
+            *self._image_input_args(image_path),  # Input image
+            *audio_input,  # Input audio
+            '-vf', self._build_video_filters(duration, watermark_text,
+                                             self.get_image_size(image_path)),  # Video filters
+            *self._output_args(duration, copy_audio),
+            str(output_path)
+        ]
+
+    def _image_input_args(self, image_path: Path) -> List[str]:
+        """FFmpeg input arguments for the looped still image."""
+        return [
+            '-framerate', '1',  # Feed the still image at 1 fps
+            '-loop', '1',  # Loop the image
+            '-i', str(image_path),
+        ]
+
+    def _output_args(self, duration: float, copy_audio: bool = False) -> List[str]:
+        """
+        Build encoding arguments for one output file.
+
+        Args:
+            duration: Video duration in seconds
+            copy_audio: Stream-copy the audio track instead of re-encoding
+
+        Returns:
+            FFmpeg argument list (without filters or output path)
+        """
+        return [
+            *self._video_argv,
+            '-threads', str(self.threads),  # Encoder threads (0 = auto)
+            '-t', str(duration),  # Duration matches audio
+            *(('-c:a', 'copy') if copy_audio else self._audio_argv),  # Copy if input matches
+            *self._mux_argv,
+        ]
+
+    def _encoder_args(self) -> List[str]:
+        """
+        Build rate control arguments for the selected video encoder.
+
+        Returns:
+            FFmpeg argument list
+        """
+        if self.video_codec == 'h264_videotoolbox':
+            return ['-q:v', '55']
+        if self.video_codec == 'h264_nvenc':
+            return ['-rc', 'vbr', '-cq', '23']
+        if self.video_codec == 'h264_vaapi':
+            return ['-qp', '23']
+
+        return [
+            '-preset', self.preset,  # Encoding speed/quality balance
+            *(['-tune', self.tune] if self.tune else []),  # Static image content
+            '-crf', '23',  # Quality (lower = better, 18-28 recommended)
+        ]
+
+    def _publish_output(self, staging_path: Path, output_path: Path) -> bool:
+        """
+        Atomically move a staged video to its final location.
+
+        Readers of output_path only ever see the previous file or the
+        complete new one. A video staged on another filesystem is first
+        copied next to output_path and then renamed into place.
+
+        Args:
+            staging_path: Path FFmpeg wrote the video to
+            output_path: Final video path
+
+        Returns:
+            True if the moved video is present and non-empty
+        """
+        if not staging_path.exists():
+            logger.error("Output video is missing or empty")
+            return False
 
-    def _build_video_filters(self, duration: float) -> str:
+        try:
+            os.replace(staging_path, output_path)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+
+            partial_path = output_path.with_name(
+                f".{output_path.stem}.{uuid.uuid4().hex}{output_path.suffix}")
+            try:
+                shutil.copyfile(staging_path, partial_path)
+                os.replace(partial_path, output_path)
+            finally:
+                partial_path.unlink(missing_ok=True)
+            staging_path.unlink()
+
+        return self._verify_output(output_path)
+
+    def _verify_output(self, output_path: Path) -> bool:
+        """Check that FFmpeg produced a non-empty video file."""
+        if output_path.exists() and output_path.stat().st_size > 0:
+            size_mb = output_path.stat().st_size / (1024 * 1024)
+            logger.info(f"✓ Video rendered: {output_path.name} ({size_mb:.2f} MB)")
+            return True
+
+        logger.error("Output video is missing or empty")
+        return False
+
+    def _build_video_filters(self, duration: float,
+                             watermark_text: Optional[str] = None,
+                             image_size: Optional[Tuple[int, int]] = None,
+                             tag: str = '') -> str:
         """
         Build FFmpeg video filter string.
 
         Adds:
-        - Scale to output dimensions
+        - Scale to output dimensions (skipped if the image already matches)
+          and convert to BT.709 limited-range YUV
+        - Optional text watermark (pre-rendered PNG overlay)
+        - Frame duplication to output fps (after scaling, so the
+          image is only scaled once per input frame)
         - Fade in (0.5s)
         - Fade out (0.5s)
 
         Args:
             duration: Video duration in seconds
+            watermark_text: Optional text watermark
+            image_size: Input image (width, height), if known
+            tag: Suffix keeping link labels unique within one filter graph
 
         Returns:
             FFmpeg filter string
         """
-        fade_duration = 0.5  # 0.5 second fades
+        # Collages are usually composed at the output size already
+        if image_size == (self.width, self.height):
+            head = self._convert_filters
+        else:
+            head = self._scale_filters
 
-        filters = [
-            f"scale={self.width}:{self.height}:force_original_aspect_ratio=decrease",
-            f"pad={self.width}:{self.height}:(ow-iw)/2:(oh-ih)/2",  # Center pad
-            f"fps={self.fps}",
-            f"fade=t=in:st=0:d={fade_duration}",  # Fade in
-            f"fade=t=out:st={duration - fade_duration}:d={fade_duration}"  # Fade out
-        ]
+        if watermark_text:
+            head = _watermark_graph(head, watermark_text, tag)
 
-        return ','.join(filters)
+        fade_out = self._fade_out_template.format(start=duration - self.fade_duration)
+        return f"{head},{self._fade_in_filters},{fade_out}"
 
     def add_watermark(self, video_path: Path, watermark_text: str,
                      output_path: Path) -> bool:
         """
-        Add text watermark to video (optional feature).
+        Add text watermark to an already rendered video.
+
+        Deprecated: this decodes and re-encodes the whole video. Pass
+        watermark_text to render_video() instead, which draws the
+        watermark during the main encode.
 
         Args:
             video_path: Path to input video
@@ -199,13 +1020,19 @@ class VideoRenderer:
         Returns:
             True if successful, False otherwise
         """
+        warnings.warn(
+            "add_watermark() re-encodes the video; pass watermark_text to "
+            "render_video() instead",
+            DeprecationWarning,
+            stacklevel=2
+        )
+
         try:
             cmd = [
                 'ffmpeg',
                 '-y',
                 '-i', str(video_path),
-                '-vf', f"drawtext=text='{watermark_text}':fontcolor=white@0.5:"
-                      f"fontsize=24:x=10:y=H-th-10",
+                '-vf', _watermark_graph('null', watermark_text),
                 '-codec:a', 'copy',
                 str(output_path)
             ]
@@ -218,7 +1045,30 @@ class VideoRenderer:
             return False
 
 
-def render_video(image_path: Path, audio_path: Path, output_path: Path) -> bool:
+_renderer: Optional[VideoRenderer] = None
+_renderer_lock = threading.Lock()
+
+
+def get_renderer() -> VideoRenderer:
+    """
+    Get the shared VideoRenderer, creating it on first use.
+
+    Returns:
+        VideoRenderer instance
+
+    Raises:
+        RuntimeError: If FFmpeg is not installed
+    """
+    global _renderer
+
+    with _renderer_lock:
+        if _renderer is None:
+            _renderer = VideoRenderer()
+        return _renderer
+
+
+def render_video(image_path: Path, audio_path: Path, output_path: Path,
+                 watermark_text: Optional[str] = None) -> bool:
     """
     Convenience function to render a video.
 
@@ -226,13 +1076,14 @@ def render_video(image_path: Path, audio_path: Path, output_path: Path) -> bool:
         image_path: Path to collage image
         audio_path: Path to audio file
         output_path: Path to save output video
+        watermark_text: Optional text watermark burned in during the encode
 
     Returns:
         True if successful, False otherwise
     """
     try:
-        renderer = VideoRenderer()
-        return renderer.render_video(image_path, audio_path, output_path)
+        renderer = get_renderer()
+        return renderer.render_video(image_path, audio_path, output_path, watermark_text)
     except RuntimeError as e:
         logger.error(f"Renderer initialization failed: {e}")
         return False
@@ -241,6 +1092,90 @@ def render_video(image_path: Path, audio_path: Path, output_path: Path) -> bool:
         return False
 
 
+def _init_render_worker(threads: int, watermarks: Dict[str, Path]) -> None:
+    """
+    Prepare a render_many worker process (runs once per process).
+
+    Lowers the process priority, gives the worker's renderer its share of
+    the encoder threads and reuses the parent's watermark PNGs. Only the
+    parent removes those PNGs: under the spawn start method each worker
+    imports this module and would otherwise delete them at its own exit,
+    while the parent and other workers still use them.
+    """
+    global _renderer
+
+    try:
+        # Stay out of the way of interactive processes
+        os.nice(10)
+    except (AttributeError, OSError):
+        pass
+
+    # A forked worker may inherit the parent's renderer; build its own instead
+    os.environ['VIDEO_THREADS'] = str(threads)
+    _renderer = None
+
+    atexit.unregister(_remove_watermarks)
+    _watermark_cache.update(watermarks)
+
+
+def _render_job(job: RenderJob, watermark_text: Optional[str] = None) -> bool:
+    """Render one job inside a render_many worker process."""
+    try:
+        renderer = get_renderer()
+        return renderer.render_video(job.image_path, job.audio_path, job.output_path,
+                                     watermark_text)
+    except RuntimeError as e:
+        logger.error(f"Renderer initialization failed: {e}")
+        return False
+
+
+def render_many(jobs: List[RenderJob], max_parallel: Optional[int] = None,
+                watermark_text: Optional[str] = None) -> List[bool]:
+    """
+    Render several reels as parallel FFmpeg processes.
+
+    Useful when render_batch doesn't fit (e.g. reels need different
+    settings). Each process gets an equal share of the CPU cores as its
+    encoder thread budget, since x264 scales poorly past a few threads.
+
+    Args:
+        jobs: Reels to render (RenderJob or equivalent tuples)
+        max_parallel: Concurrent FFmpeg processes (default: cores / 4)
+        watermark_text: Optional text watermark applied to every reel
+
+    Returns:
+        Per-job success flags, in the order of jobs
+    """
+    jobs = [RenderJob(*job) for job in jobs]
+    if not jobs:
+        return []
+
+    cpu_count = os.cpu_count() or 1
+    if max_parallel is None:
+        max_parallel = max(1, cpu_count // 4)
+    max_parallel = min(max_parallel, len(jobs))
+    threads = max(1, cpu_count // max_parallel)
+
+    logger.info(f"Rendering {len(jobs)} videos, {max_parallel} at a time "
+                f"({threads} threads each)")
+
+    try:
+        # Rasterize the watermark once here and share it with every worker
+        if watermark_text:
+            _watermark_image(watermark_text)
+        with _watermark_lock:
+            watermarks = dict(_watermark_cache)
+
+        with ProcessPoolExecutor(max_workers=max_parallel,
+                                 initializer=_init_render_worker,
+                                 initargs=(threads, watermarks)) as executor:
+            return list(executor.map(_render_job, jobs,
+                                     [watermark_text] * len(jobs)))
+    except Exception as e:
+        logger.error(f"Parallel rendering failed: {e}", exc_info=True)
+        return [False] * len(jobs)
+
+
 def main():
     """Test the video renderer."""
     import sys
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Folklorovich - JSON Serialization
+Thin JSON layer that uses orjson when installed and falls back to the
+standard library otherwise.
+
+Files should be opened in binary mode ('rb'/'wb'); dumps() returns bytes
+with either backend.
+
+Author: Folklorovich Project
+Date: 2025-12-05
+"""
+
+import os
+import mmap
+from typing import Any
+
+# Files larger than this are parsed from a memory map instead of a read copy
+MMAP_THRESHOLD = 64 * 1024
+
+try:
+    import orjson
+
+    def loads(data: bytes) -> Any:
+        """Parse JSON from bytes or str."""
+        return orjson.loads(data)
+
+    def load_path(path) -> Any:
+        """Parse a JSON file, memory-mapping it when it is large."""
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size <= MMAP_THRESHOLD:
+                return orjson.loads(f.read())
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                    memoryview(mm) as view:
+                return orjson.loads(view)
+
+    def dumps(obj: Any) -> bytes:
+        """Serialize obj as indented UTF-8 JSON ending in a newline."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+
+    def dumps_line(obj: Any) -> bytes:
+        """Serialize obj as one compact JSON line (JSONL record)."""
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+
+except ImportError:
+    import json
+
+    def loads(data: bytes) -> Any:
+        """Parse JSON from bytes or str."""
+        return json.loads(data)
+
+    def load_path(path) -> Any:
+        """Parse a JSON file (the stdlib parser cannot read a memory map)."""
+        with open(path, 'rb') as f:
+            return json.load(f)
+
+    def dumps(obj: Any) -> bytes:
+        """Serialize obj as indented UTF-8 JSON ending in a newline."""
+        return (json.dumps(obj, indent=2, ensure_ascii=False) + '\n').encode('utf-8')
+
+    def dumps_line(obj: Any) -> bytes:
+        """Serialize obj as one compact JSON line (JSONL record)."""
+        return (json.dumps(obj, separators=(',', ':'), ensure_ascii=False) + '\n').encode('utf-8')
@@ -9,8 +9,13 @@ Date: 2025-12-05
 
 import os
 import sys
-import json
 import time
+import shutil
+import threading
+import importlib
+import importlib.util
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Tuple
 
@@ -18,11 +23,87 @@ from typing import List, Dict, Tuple
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+from scripts import serialization
 from scripts.utils import setup_logging, validate_image, validate_audio, validate_video
 
 # Initialize logging
 logger = setup_logging('test_pipeline', level='INFO')
 
+# Directories without which no other test can meaningfully run
+CRITICAL_DIRS = ('content', 'scripts')
+
+# Separator line around log sections
+BAR = '=' * 60
+
+# ASCII status labels, indexed by passed (safe for any console encoding)
+_STATUS = ('[FAIL]', '[PASS]')
+
+# Summary emoji only where the console can display them
+_EMOJI = (sys.stdout.encoding or '').lower().replace('-', '') == 'utf8'
+
+# Fields every folklore database entry must have
+REQUIRED_KEYS = frozenset(['id', 'name', 'category', 'story_full', 'visual_tags',
+                           'voice_tone', 'theme'])
+
+
+def _exists(path) -> bool:
+    """Check a path with a single lstat call (no symlink resolution)."""
+    try:
+        os.lstat(path)
+        return True
+    except OSError:
+        return False
+
+
+def _load_env(path) -> Dict[str, str]:
+    """
+    Load KEY=value lines from a .env file into os.environ.
+
+    Minimal stand-in for python-dotenv: skips blanks and comments, takes
+    quoted values up to the closing quote, drops inline comments from
+    unquoted values, and never overrides variables already set. Bytes that
+    aren't valid UTF-8 are replaced rather than failing the suite.
+
+    Args:
+        path: Path to .env file (missing files are ignored)
+
+    Returns:
+        Parsed variables from the file
+    """
+    env = {}
+    try:
+        with open(path, 'rb') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith(b'#') or b'=' not in line:
+                    continue
+                key, value = line.split(b'=', 1)
+                value = value.strip()
+                quote = value[:1]
+                if quote in (b'"', b"'") and quote in value[1:]:
+                    # Quoted: the value ends at the closing quote
+                    value = value[1:value.index(quote, 1)]
+                else:
+                    # Unquoted: a '#' after whitespace starts a comment
+                    for comment in (b' #', b'\t#'):
+                        value = value.split(comment, 1)[0]
+                    value = value.rstrip()
+                env[key.strip().decode(errors='replace')] = value.decode(errors='replace')
+    except FileNotFoundError:
+        pass
+
+    for key, value in env.items():
+        os.environ.setdefault(key, value)
+    return env
+
+
+def _makedirs(path):
+    """Create a directory tree, ignoring one that already exists."""
+    try:
+        os.makedirs(path)
+    except FileExistsError:
+        pass
+
 
 class PipelineTester:
     """Comprehensive testing suite for Folklorovich."""
@@ -34,33 +115,129 @@ class PipelineTester:
         self.output_dir = self.project_root / 'output'
         self.scripts_dir = self.project_root / 'scripts'
 
+        # String forms for os.path joins in loops (no Path allocations)
+        self._root = os.fspath(self.project_root)
+        self._content_root = os.fspath(self.content_dir)
+
         self.tests_passed = 0
         self.tests_failed = 0
-        self.test_results = []
+        self.failed_results = []
+        self.missing_dirs = []
+
+        # Every result is streamed to this JSONL file as it is recorded
+        self.results_path = self.project_root / 'logs/test_report.jsonl'
+        self._results_file = None
+
+        # Per-thread output buffer while tests run concurrently
+        self._local = threading.local()
+
+        # Parsed config files, shared between tests; each lock makes sure
+        # concurrent tests parse a file only once
+        self._db_cache = None
+        self._db_stats_cache = None
+        self._metadata_cache = None
+        self._env_cache = None
+        self._db_lock = threading.Lock()
+        self._db_stats_lock = threading.Lock()
+        self._metadata_lock = threading.Lock()
+        self._env_lock = threading.Lock()
+
+    def _emit(self, func, *args):
+        """Call func now, or defer it if the current thread is buffering output."""
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None:
+            func(*args)
+        else:
+            buffer.append((func, args))
+
+    def _section(self, title: str):
+        """Log a test section header."""
+        self._emit(self._log_banner, title)
+
+    def _log_banner(self, title: str):
+        """Write a section header to the log."""
+        logger.info("\n%s\n%s\n%s", BAR, title, BAR)
 
     def log_test(self, test_name: str, passed: bool, message: str = ""):
         """Log test result."""
-        status = "✅ PASS" if passed else "❌ FAIL"
-        logger.info(f"{status}: {test_name}")
+        self._emit(self._record_test, test_name, passed, message)
+
+    def _record_test(self, test_name: str, passed: bool, message: str = ""):
+        """Write a test result to the log and tally it."""
+        logger.info("%s: %s", _STATUS[passed], test_name)
         if message:
-            logger.info(f"    {message}")
+            logger.info("    %s", message)
 
-        self.test_results.append({
+        result = {
             'test': test_name,
             'passed': passed,
             'message': message
-        })
+        }
+
+        if self._results_file is None:
+            _makedirs(self.results_path.parent)
+            self._results_file = open(self.results_path, 'wb')
+        self._results_file.write(serialization.dumps_line(result))
 
         if passed:
             self.tests_passed += 1
         else:
             self.tests_failed += 1
+            self.failed_results.append(result)
+
+    def _load_db(self) -> Dict:
+        """Parse folklore_database.json once and reuse it across tests."""
+        with self._db_lock:
+            if self._db_cache is None:
+                self._db_cache = serialization.load_path(
+                    os.path.join(self._content_root, 'folklore_database.json'))
+            return self._db_cache
+
+    def _db_stats(self) -> Dict:
+        """
+        Summarize the folklore database in a single pass (cached).
+
+        Returns:
+            Dict with 'count', 'incomplete' (entry id -> missing fields)
+            and 'categories' (Counter of category names)
+        """
+        with self._db_stats_lock:
+            if self._db_stats_cache is None:
+                entries = self._load_db().get('folklore', [])
+                incomplete = {}
+                categories = Counter()
+
+                for index, entry in enumerate(entries):
+                    missing = REQUIRED_KEYS - entry.keys()
+                    if missing:
+                        incomplete[entry.get('id', f"#{index}")] = sorted(missing)
+                    categories[entry.get('category', 'unknown')] += 1
+
+                self._db_stats_cache = {
+                    'count': len(entries),
+                    'incomplete': incomplete,
+                    'categories': categories
+                }
+            return self._db_stats_cache
+
+    def _load_metadata(self) -> Dict:
+        """Parse metadata.json once and reuse it across tests."""
+        with self._metadata_lock:
+            if self._metadata_cache is None:
+                self._metadata_cache = serialization.load_path(
+                    os.path.join(self._content_root, 'metadata.json'))
+            return self._metadata_cache
+
+    def _env(self) -> Dict[str, str]:
+        """Parse the project's .env once and reuse it."""
+        with self._env_lock:
+            if self._env_cache is None:
+                self._env_cache = _load_env(os.path.join(self._root, '.env'))
+            return self._env_cache
 
     def test_project_structure(self) -> bool:
         """Test 1: Verify project structure."""
-        logger.info("\n" + "="*60)
-        logger.info("TEST 1: Project Structure")
-        logger.info("="*60)
+        self._section("TEST 1: Project Structure")
 
         required_dirs = [
             'content',
@@ -73,101 +250,105 @@ class PipelineTester:
             'logs'
         ]
 
-        all_exist = True
+        # One shallow walk instead of stat-ing every path: list the root,
+        # then only the top-level parents of nested required dirs
+        parents = {dir_path.split('/')[0] for dir_path in required_dirs if '/' in dir_path}
+        found_dirs = set()
+        for walk_path, dir_names, _ in os.walk(self._root):
+            rel = os.path.relpath(walk_path, self._root)
+            prefix = '' if rel == '.' else rel.replace(os.sep, '/') + '/'
+            found_dirs.update(prefix + name for name in dir_names)
+            dir_names[:] = [name for name in dir_names if name in parents] if rel == '.' else []
+
+        self.missing_dirs = [dir_path for dir_path in required_dirs
+                             if dir_path not in found_dirs]
         for dir_path in required_dirs:
-            full_path = self.project_root / dir_path
-            exists = full_path.exists()
-            self.log_test(f"Directory exists: {dir_path}", exists)
-            if not exists:
-                all_exist = False
+            self.log_test(f"Directory exists: {dir_path}", dir_path not in self.missing_dirs)
 
-        return all_exist
+        return not self.missing_dirs
 
     def test_configuration_files(self) -> bool:
         """Test 2: Verify configuration files."""
-        logger.info("\n" + "="*60)
-        logger.info("TEST 2: Configuration Files")
-        logger.info("="*60)
+        self._section("TEST 2: Configuration Files")
 
-        all_valid = True
+        # Each check stops at its own parse failure without affecting the others
+        results = [
+            self._check_folklore_db(),
+            self._check_metadata(),
+            self._check_templates()
+        ]
 
-        # Test folklore database
-        db_path = self.content_dir / 'folklore_database.json'
-        try:
-            with open(db_path, 'r') as f:
-                db_data = json.load(f)
+        return all(results)
 
-            folklore_count = len(db_data.get('folklore', []))
-            expected_count = 75
+    def _check_folklore_db(self) -> bool:
+        """Check folklore_database.json entry count and entry fields."""
+        try:
+            stats = self._db_stats()
+        except Exception as e:
+            self.log_test("Folklore database readable", False, str(e))
+            return False
 
-            self.log_test(
-                "Folklore database valid",
-                folklore_count == expected_count,
-                f"Found {folklore_count} entries (expected {expected_count})"
-            )
+        folklore_count = stats['count']
+        expected_count = 75
 
-            if folklore_count != expected_count:
-                all_valid = False
+        self.log_test(
+            "Folklore database valid",
+            folklore_count == expected_count,
+            f"Found {folklore_count} entries (expected {expected_count})"
+        )
 
-            # Check first entry structure
-            if db_data.get('folklore'):
-                entry = db_data['folklore'][0]
-                required_keys = ['id', 'name', 'category', 'story_full', 'visual_tags', 'voice_tone', 'theme']
+        # Check every entry's structure
+        incomplete = stats['incomplete']
+        if incomplete:
+            examples = ', '.join(f"{entry_id}: {keys}"
+                                 for entry_id, keys in list(incomplete.items())[:3])
+            message = f"{len(incomplete)} incomplete, e.g. {examples}"
+        else:
+            message = f"All {folklore_count} entries complete"
 
-                for key in required_keys:
-                    has_key = key in entry
-                    self.log_test(f"Entry has '{key}' field", has_key)
-                    if not has_key:
-                        all_valid = False
+        self.log_test("Entries have required fields", not incomplete, message)
 
-        except Exception as e:
-            self.log_test("Folklore database readable", False, str(e))
-            all_valid = False
+        return folklore_count == expected_count and not incomplete
 
-        # Test metadata
-        meta_path = self.content_dir / 'metadata.json'
+    def _check_metadata(self) -> bool:
+        """Check metadata.json has every required section."""
         try:
-            with open(meta_path, 'r') as f:
-                meta_data = json.load(f)
-
-            required_sections = ['project_info', 'content_rotation', 'generation_history', 'statistics']
-            for section in required_sections:
-                has_section = section in meta_data
-                self.log_test(f"Metadata has '{section}' section", has_section)
-                if not has_section:
-                    all_valid = False
-
+            meta_data = self._load_metadata()
         except Exception as e:
             self.log_test("Metadata readable", False, str(e))
-            all_valid = False
-
-        # Test collage templates
-        templates_path = self.project_root / 'assets/templates/collage_layouts.json'
-        try:
-            with open(templates_path, 'r') as f:
-                templates_data = json.load(f)
-
-            template_count = len(templates_data.get('templates', []))
-            self.log_test(
-                "Collage templates valid",
-                template_count >= 8,
-                f"Found {template_count} templates"
-            )
+            return False
 
-            if template_count < 8:
+        all_valid = True
+        required_sections = ['project_info', 'content_rotation', 'generation_history', 'statistics']
+        for section in required_sections:
+            has_section = section in meta_data
+            self.log_test(f"Metadata has '{section}' section", has_section)
+            if not has_section:
                 all_valid = False
 
+        return all_valid
+
+    def _check_templates(self) -> bool:
+        """Check collage_layouts.json defines enough templates."""
+        templates_path = os.path.join(self._root, 'assets', 'templates', 'collage_layouts.json')
+        try:
+            templates_data = serialization.load_path(templates_path)
         except Exception as e:
             self.log_test("Collage templates readable", False, str(e))
-            all_valid = False
+            return False
 
-        return all_valid
+        template_count = len(templates_data.get('templates', []))
+        self.log_test(
+            "Collage templates valid",
+            template_count >= 8,
+            f"Found {template_count} templates"
+        )
+
+        return template_count >= 8
 
     def test_dependencies(self) -> bool:
         """Test 3: Check system dependencies."""
-        logger.info("\n" + "="*60)
-        logger.info("TEST 3: System Dependencies")
-        logger.info("="*60)
+        self._section("TEST 3: System Dependencies")
 
         all_installed = True
 
@@ -179,46 +360,29 @@ class PipelineTester:
             'dotenv'
         ]
 
+        # Resolve without importing: executing PIL/edge_tts init isn't needed here
         for package in packages:
             try:
-                __import__(package)
+                if importlib.util.find_spec(package) is None:
+                    raise ImportError(f"No module named '{package}'")
                 self.log_test(f"Python package: {package}", True)
             except ImportError as e:
                 self.log_test(f"Python package: {package}", False, str(e))
                 all_installed = False
 
-        # Test FFmpeg
-        import subprocess
-        try:
-            result = subprocess.run(['ffmpeg', '-version'], capture_output=True, timeout=5)
-            ffmpeg_works = result.returncode == 0
-            self.log_test("FFmpeg installed", ffmpeg_works)
-            if not ffmpeg_works:
+        # Test FFmpeg and FFprobe (PATH lookup, no process spawn)
+        for name, binary in (('FFmpeg', 'ffmpeg'), ('FFprobe', 'ffprobe')):
+            binary_path = shutil.which(binary)
+            self.log_test(f"{name} installed", binary_path is not None,
+                          binary_path or f"{binary} not found on PATH")
+            if not binary_path:
                 all_installed = False
-        except Exception as e:
-            self.log_test("FFmpeg installed", False, str(e))
-            all_installed = False
-
-        # Test FFprobe
-        try:
-            result = subprocess.run(['ffprobe', '-version'], capture_output=True, timeout=5)
-            ffprobe_works = result.returncode == 0
-            self.log_test("FFprobe installed", ffprobe_works)
-            if not ffprobe_works:
-                all_installed = False
-        except Exception as e:
-            self.log_test("FFprobe installed", False, str(e))
-            all_installed = False
 
         return all_installed
 
     def test_script_imports(self) -> bool:
         """Test 4: Verify all scripts can be imported."""
-        logger.info("\n" + "="*60)
-        logger.info("TEST 4: Script Imports")
-        logger.info("="*60)
-
-        all_importable = True
+        self._section("TEST 4: Script Imports")
 
         scripts = [
             'utils',
@@ -229,79 +393,76 @@ class PipelineTester:
             'generate_daily_content_v2'
         ]
 
+        # Resolve everything first, then report in one pass
+        errors = {}
         for script in scripts:
             try:
-                __import__(f'scripts.{script}')
-                self.log_test(f"Import: scripts/{script}.py", True)
+                if script == 'utils':
+                    # Used by the suite itself, so really import it
+                    importlib.import_module('scripts.utils')
+                elif importlib.util.find_spec(f'scripts.{script}') is None:
+                    raise ImportError(f"No module named 'scripts.{script}'")
             except Exception as e:
-                self.log_test(f"Import: scripts/{script}.py", False, str(e))
-                all_importable = False
+                errors[script] = e
+
+        for script in scripts:
+            error = errors.get(script)
+            self.log_test(f"Import: scripts/{script}.py", error is None,
+                          str(error) if error else "")
 
-        return all_importable
+        return not errors
 
     def test_folklore_categories(self) -> bool:
         """Test 5: Verify folklore category distribution."""
-        logger.info("\n" + "="*60)
-        logger.info("TEST 5: Folklore Categories")
-        logger.info("="*60)
+        self._section("TEST 5: Folklore Categories")
 
         try:
-            with open(self.content_dir / 'folklore_database.json', 'r') as f:
-                db_data = json.load(f)
-
-            categories = {}
-            for entry in db_data.get('folklore', []):
-                cat = entry.get('category', 'unknown')
-                categories[cat] = categories.get(cat, 0) + 1
-
-            expected = {
-                'household_spirits': 15,
-                'mythical_creatures': 15,
-                'superstitions': 15,
-                'rituals_traditions': 10,
-                'curses_omens': 10,
-                'folk_heroes': 10
-            }
-
-            all_correct = True
-            for cat, expected_count in expected.items():
-                actual_count = categories.get(cat, 0)
-                is_correct = actual_count == expected_count
-
-                self.log_test(
-                    f"Category '{cat}'",
-                    is_correct,
-                    f"{actual_count}/{expected_count} entries"
-                )
-
-                if not is_correct:
-                    all_correct = False
-
-            return all_correct
-
+            categories = self._db_stats()['categories']
         except Exception as e:
             self.log_test("Category distribution check", False, str(e))
             return False
 
+        expected = {
+            'household_spirits': 15,
+            'mythical_creatures': 15,
+            'superstitions': 15,
+            'rituals_traditions': 10,
+            'curses_omens': 10,
+            'folk_heroes': 10
+        }
+
+        all_correct = True
+        for cat, expected_count in expected.items():
+            actual_count = categories[cat]
+            is_correct = actual_count == expected_count
+
+            self.log_test(
+                f"Category '{cat}'",
+                is_correct,
+                f"{actual_count}/{expected_count} entries"
+            )
+
+            if not is_correct:
+                all_correct = False
+
+        return all_correct
+
     def test_env_variables(self) -> bool:
         """Test 6: Check environment variables."""
-        logger.info("\n" + "="*60)
-        logger.info("TEST 6: Environment Variables")
-        logger.info("="*60)
+        self._section("TEST 6: Environment Variables")
 
-        from dotenv import load_dotenv
-        load_dotenv(self.project_root / '.env')
+        env = self._env()
 
         # Check if .env file exists
         env_file = self.project_root / '.env'
-        env_exists = env_file.exists()
+        env_exists = _exists(env_file)
 
         if not env_exists:
             # Check template
             template_file = self.project_root / '.env.template'
             self.log_test(
                 "Environment configuration",
-                template_file.exists(),
+                _exists(template_file),
                 ".env not found, but .env.template exists"
             )
             return False
@@ -309,7 +470,8 @@ class PipelineTester:
         self.log_test("Environment file exists", True, ".env file found")
 
         # Check for required keys (don't log values for security)
-        has_unsplash = os.getenv('UNSPLASH_ACCESS_KEY') is not None
+        has_unsplash = bool(env.get('UNSPLASH_ACCESS_KEY')
+                            or os.environ.get('UNSPLASH_ACCESS_KEY'))
         self.log_test(
             "UNSPLASH_ACCESS_KEY configured",
             has_unsplash,
@@ -320,9 +482,7 @@ class PipelineTester:
 
     def test_utility_functions(self) -> bool:
         """Test 7: Test utility functions."""
-        logger.info("\n" + "="*60)
-        logger.info("TEST 7: Utility Functions")
-        logger.info("="*60)
+        self._section("TEST 7: Utility Functions")
 
         all_working = True
 
@@ -349,7 +509,7 @@ class PipelineTester:
             track_api_usage('test_api', 'test_call')
 
             usage_file = self.project_root / 'logs/api_usage.json'
-            self.log_test("API usage tracking works", usage_file.exists())
+            self.log_test("API usage tracking works", _exists(usage_file))
         except Exception as e:
             self.log_test("API usage tracking works", False, str(e))
             all_working = False
@@ -358,13 +518,10 @@ class PipelineTester:
 
     def test_cycle_rotation(self) -> bool:
         """Test 8: Test content rotation logic."""
-        logger.info("\n" + "="*60)
-        logger.info("TEST 8: Content Rotation")
-        logger.info("="*60)
+        self._section("TEST 8: Content Rotation")
 
         try:
-            with open(self.content_dir / 'metadata.json', 'r') as f:
-                metadata = json.load(f)
+            metadata = self._load_metadata()
 
             rotation = metadata.get('content_rotation', {})
 
@@ -385,72 +542,116 @@ class PipelineTester:
 
     def generate_test_report(self):
         """Generate final test report."""
-        logger.info("\n" + "="*60)
-        logger.info("TEST SUMMARY")
-        logger.info("="*60)
+        self._log_banner("TEST SUMMARY")
 
         total_tests = self.tests_passed + self.tests_failed
         pass_rate = (self.tests_passed / total_tests * 100) if total_tests > 0 else 0
 
-        logger.info(f"Total Tests: {total_tests}")
-        logger.info(f"Passed: {self.tests_passed} ✅")
-        logger.info(f"Failed: {self.tests_failed} ❌")
-        logger.info(f"Pass Rate: {pass_rate:.1f}%")
-        logger.info("="*60)
+        logger.info("Total Tests: %d", total_tests)
+        logger.info("Passed: %d%s", self.tests_passed, " ✅" if _EMOJI else "")
+        logger.info("Failed: %d%s", self.tests_failed, " ❌" if _EMOJI else "")
+        logger.info("Pass Rate: %.1f%%", pass_rate)
+        logger.info(BAR)
 
         if self.tests_failed > 0:
             logger.info("\nFailed Tests:")
-            for result in self.test_results:
-                if not result['passed']:
-                    logger.info(f"  ❌ {result['test']}")
-                    if result['message']:
-                        logger.info(f"     {result['message']}")
+            for result in self.failed_results:
+                logger.info("  %s %s", _STATUS[False], result['test'])
+                if result['message']:
+                    logger.info("         %s", result['message'])
 
-        # Save report to file
-        report_path = self.project_root / 'logs/test_report.json'
-        report_path.parent.mkdir(parents=True, exist_ok=True)
+        if self._results_file is not None:
+            self._results_file.close()
+            self._results_file = None
 
-        with open(report_path, 'w') as f:
-            json.dump({
-                'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
-                'total_tests': total_tests,
-                'passed': self.tests_passed,
-                'failed': self.tests_failed,
-                'pass_rate': pass_rate,
-                'results': self.test_results
-            }, f, indent=2)
+        # Save summary to file (per-test results are in the JSONL file)
+        report_path = self.project_root / 'logs/test_report.json'
+        _makedirs(report_path.parent)
+
+        payload = serialization.dumps({
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'total_tests': total_tests,
+            'passed': self.tests_passed,
+            'failed': self.tests_failed,
+            'pass_rate': pass_rate,
+            'failures': self.failed_results,
+            'results_file': self.results_path.name
+        })
+        with open(report_path, 'wb') as f:
+            f.write(payload)
 
-        logger.info(f"\n📄 Full report saved to: {report_path}")
+        logger.info("\n%sReport saved to: %s", "📄 " if _EMOJI else "", report_path)
+        logger.info("%sAll results saved to: %s", "📄 " if _EMOJI else "", self.results_path)
 
         return self.tests_failed == 0
 
+    def _run_buffered(self, test) -> List[Tuple]:
+        """
+        Run one test with its log output buffered.
+
+        Args:
+            test: Bound test method
+
+        Returns:
+            Deferred (func, args) output calls, in the order the test made them
+        """
+        self._local.buffer = []
+        try:
+            test()
+            return self._local.buffer
+        finally:
+            self._local.buffer = None
+
+    def _run_concurrently(self, tests: List):
+        """
+        Run tests in a thread pool and replay their output in test order.
+
+        Args:
+            tests: Bound test methods
+        """
+        with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+            futures = [executor.submit(self._run_buffered, test) for test in tests]
+
+            for future in futures:
+                for func, args in future.result():
+                    func(*args)
+
     def run_all_tests(self) -> bool:
         """Run all tests."""
-        logger.info("🧪 Starting Folklorovich Test Suite...")
-        logger.info(f"📁 Project Root: {self.project_root}")
+        logger.info("%sStarting Folklorovich Test Suite...", "🧪 " if _EMOJI else "")
+        logger.info("%sProject Root: %s", "📁 " if _EMOJI else "", self.project_root)
 
         start_time = time.time()
 
-        # Run all tests
+        # Pre-flight: without the core directories every other test fails
         self.test_project_structure()
-        self.test_configuration_files()
-        self.test_dependencies()
-        self.test_script_imports()
-        self.test_folklore_categories()
-        self.test_env_variables()
-        self.test_utility_functions()
-        self.test_cycle_rotation()
+        missing_critical = [d for d in CRITICAL_DIRS if d in self.missing_dirs]
+
+        if missing_critical:
+            logger.error("Pre-flight failed, missing: %s. Skipping remaining tests.",
+                         ', '.join(missing_critical))
+        else:
+            # The rest are mostly file and import I/O, so run them concurrently
+            self._run_concurrently([
+                self.test_configuration_files,
+                self.test_dependencies,
+                self.test_script_imports,
+                self.test_folklore_categories,
+                self.test_env_variables,
+                self.test_utility_functions,
+                self.test_cycle_rotation
+            ])
 
         # Generate report
         elapsed = time.time() - start_time
-        logger.info(f"\n⏱️  Tests completed in {elapsed:.2f} seconds")
+        logger.info("\n%sTests completed in %.2f seconds", "⏱️  " if _EMOJI else "", elapsed)
 
         all_passed = self.generate_test_report()
 
         if all_passed:
-            logger.info("\n🎉 ALL TESTS PASSED! System is ready for production.")
+            logger.info("\n%sALL TESTS PASSED! System is ready for production.", "🎉 " if _EMOJI else "")
         else:
-            logger.warning("\n⚠️  Some tests failed. Please fix issues before deployment.")
+            logger.warning("\n%sSome tests failed. Please fix issues before deployment.", "⚠️  " if _EMOJI else "")
 
         return all_passed
 
@@ -9,30 +9,186 @@ Date: 2025-12-05
 
 import os
 import sys
-import json
 import time
+import queue
+import random
+import struct
+import atexit
 import logging
+import threading
 import functools
 from pathlib import Path
-from datetime import datetime
-from typing import Optional, Callable, Any, Dict
-from logging.handlers import RotatingFileHandler
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Optional, Callable, Any, Dict, List, Tuple
+from logging.handlers import (
+    RotatingFileHandler, TimedRotatingFileHandler, MemoryHandler, QueueHandler, QueueListener
+)
+
+from scripts import serialization
+
+try:
+    import av  # Optional: in-process media probing
+except ImportError:
+    av = None
+
+try:
+    import fcntl  # Optional: cross-process lock for the API usage file
+except ImportError:
+    fcntl = None
 
 # Project paths
 PROJECT_ROOT = Path(__file__).parent.parent
 LOGS_DIR = PROJECT_ROOT / 'logs'
 OUTPUT_DIR = PROJECT_ROOT / 'output'
 
+# File handlers buffer this many records and write them out in one batch
+LOG_BUFFER_CAPACITY = 1024
+
+# Buffered log records are also written out at least this often (seconds),
+# so a killed or hung run still leaves its log behind
+LOG_FLUSH_INTERVAL = 30.0
+
+# Rotating log files check their size once per this many records
+ROLLOVER_CHECK_INTERVAL = 64
+
+# Shared by every handler; setup_logging may run many times per process
+_FMT = logging.Formatter(
+    '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+# Output subdirectories measured by check_storage_usage
+STORAGE_DIRS = ('images', 'audio', 'videos')
+
+# check_storage_usage results are reused for this many seconds
+STORAGE_CACHE_TTL = 60
+_storage_cache: Dict[str, Any] = {'ts': 0.0, 'val': None}
+_storage_lock = threading.Lock()
+
+# File types accepted by validate_image
+IMAGE_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.webp', '.gif', '.bmp', '.tif', '.tiff'})
+
+# ffprobe timeout (seconds) when PyAV is not installed
+PROBE_TIMEOUT = 15
+
+# API usage counters are written to disk in batches
+USAGE_FILE = LOGS_DIR / 'api_usage.json'
+USAGE_FLUSH_EVERY = 50
+USAGE_FLUSH_INTERVAL = 10.0
+_usage_lock = threading.Lock()
+_usage_state: Dict[str, Any] = {'pending': {}, 'dirty': 0, 'last_flush': 0.0}
+_day_cache: Dict[str, Any] = {'until': 0.0, 'day': ''}
+
+
+class LazyRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler that checks the file size every few records.
+
+    The stock handler seeks to the end of the stream on every record. Checking
+    every ROLLOVER_CHECK_INTERVAL records instead lets a file overshoot
+    maxBytes by at most that many records (a few KB against a multi-MB limit).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._records_since_check = 0
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        self._records_since_check += 1
+        if self._records_since_check < ROLLOVER_CHECK_INTERVAL:
+            return False
+
+        self._records_since_check = 0
+        return bool(super().shouldRollover(record))
+
+
+class _PeriodicFlusher(threading.Thread):
+    """Daemon thread that flushes buffered handlers every LOG_FLUSH_INTERVAL seconds."""
+
+    def __init__(self, handlers: List[logging.Handler]):
+        super().__init__(name='log-flusher', daemon=True)
+        self._handlers = handlers
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(LOG_FLUSH_INTERVAL):
+            for handler in self._handlers:
+                handler.flush()
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
+
+
+def _buffered(handler: logging.Handler) -> MemoryHandler:
+    """
+    Wrap a file handler so records are written in batches.
+
+    The buffer flushes when it fills, on any ERROR record, on close, and
+    every LOG_FLUSH_INTERVAL seconds via the logger's _PeriodicFlusher.
+
+    Args:
+        handler: Concrete handler that performs the writes
+
+    Returns:
+        MemoryHandler targeting the given handler
+    """
+    buffered = MemoryHandler(
+        LOG_BUFFER_CAPACITY,
+        flushLevel=logging.ERROR,
+        target=handler,
+        flushOnClose=True
+    )
+    buffered.setLevel(handler.level)
+    return buffered
+
+
+def _close_handlers(logger: logging.Logger) -> None:
+    """
+    Stop the logging listener and close all handlers of a logger.
+
+    Queued and buffered records are written out first. Registered with
+    atexit and used when setup_logging reconfigures an existing logger.
+
+    Args:
+        logger: Logger previously configured by setup_logging
+    """
+    flusher = getattr(logger, '_flusher', None)
+    if flusher is not None:
+        flusher.stop()
+        logger._flusher = None
+
+    listener = getattr(logger, '_listener', None)
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            target = getattr(handler, 'target', None)
+            handler.close()
+            if target is not None:
+                target.close()
+        logger._listener = None
+
+    for handler in logger.handlers:
+        handler.close()
+    logger.handlers.clear()
+
 
 def setup_logging(name: str = 'folklorovich', level: str = 'INFO') -> logging.Logger:
     """
     Set up comprehensive logging with rotating file handlers.
 
     Creates:
-    - Daily rotating log files in logs/ directory
+    - Rotating log file in logs/ directory
+    - Daily log file rotated at midnight
     - Console output for real-time monitoring
     - Separate error log for failures
 
+    The logger itself only enqueues records; a background QueueListener
+    formats and writes them. File output is additionally buffered and
+    flushed on ERROR records, every LOG_FLUSH_INTERVAL seconds and at
+    interpreter exit.
+
     Args:
         name: Logger name
         level: Logging level (DEBUG, INFO, WARNING, ERROR)
@@ -47,62 +203,88 @@ def setup_logging(name: str = 'folklorovich', level: str = 'INFO') -> logging.Lo
     logger = logging.getLogger(name)
     logger.setLevel(getattr(logging, level.upper()))
 
-    # Remove existing handlers to avoid duplicates
-    logger.handlers.clear()
-
-    # Format
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
+    # Remove existing handlers to avoid duplicates (flushing any pending records)
+    _close_handlers(logger)
 
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.INFO)
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    console_handler.setFormatter(_FMT)
 
     # Main log file (rotating, 10MB max, keep 7 backups)
     log_file = LOGS_DIR / f"{name}.log"
-    file_handler = RotatingFileHandler(
+    file_handler = LazyRotatingFileHandler(
         log_file,
         maxBytes=10 * 1024 * 1024,  # 10 MB
         backupCount=7
     )
     file_handler.setLevel(logging.DEBUG)
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    file_handler.setFormatter(_FMT)
 
     # Error log file (only errors and critical)
     error_log = LOGS_DIR / f"{name}_errors.log"
-    error_handler = RotatingFileHandler(
+    error_handler = LazyRotatingFileHandler(
         error_log,
         maxBytes=5 * 1024 * 1024,  # 5 MB
         backupCount=3
     )
     error_handler.setLevel(logging.ERROR)
-    error_handler.setFormatter(formatter)
-    logger.addHandler(error_handler)
-
-    # Daily log file (one file per day)
-    daily_log = LOGS_DIR / f"{name}_{datetime.now().strftime('%Y-%m-%d')}.log"
-    daily_handler = logging.FileHandler(daily_log)
+    error_handler.setFormatter(_FMT)
+
+    # Daily log file (rotated at midnight, keep 7 days; opened on first write)
+    daily_log = LOGS_DIR / f"{name}.daily.log"
+    daily_handler = TimedRotatingFileHandler(
+        daily_log,
+        when='midnight',
+        backupCount=7,
+        delay=True
+    )
     daily_handler.setLevel(logging.INFO)
-    daily_handler.setFormatter(formatter)
-    logger.addHandler(daily_handler)
+    daily_handler.setFormatter(_FMT)
+
+    # Callers only pay for a queue put; the listener thread does the I/O
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(log_queue))
+
+    buffered_handlers = [_buffered(file_handler), _buffered(daily_handler)]
+    logger._listener = QueueListener(
+        log_queue,
+        console_handler,
+        buffered_handlers[0],
+        error_handler,
+        buffered_handlers[1],
+        respect_handler_level=True
+    )
+    logger._listener.start()
+
+    logger._flusher = _PeriodicFlusher(buffered_handlers)
+    logger._flusher.start()
+
+    # Write out whatever is still pending on shutdown
+    if not getattr(logger, '_close_registered', False):
+        atexit.register(_close_handlers, logger)
+        logger._close_registered = True
 
     return logger
 
 
 def retry_with_backoff(max_retries: int = 3, backoff_factor: float = 2.0,
-                       exceptions: tuple = (Exception,)):
+                       exceptions: tuple = (Exception,), max_delay: float = 30.0,
+                       jitter: float = 0.5, unrecoverable: tuple = ()):
     """
     Decorator for retrying functions with exponential backoff.
 
+    Each wait is randomized by +/- jitter so parallel workers that fail
+    together do not all retry at the same moment.
+
     Args:
         max_retries: Maximum number of retry attempts
         backoff_factor: Multiplier for wait time between retries
         exceptions: Tuple of exceptions to catch and retry
+        max_delay: Upper bound for a single wait in seconds
+        jitter: Relative random spread of each wait (0.5 = +/-50%)
+        unrecoverable: Exceptions re-raised immediately without retrying,
+            even if they also match exceptions
 
     Example:
         @retry_with_backoff(max_retries=3, backoff_factor=2.0)
@@ -113,17 +295,20 @@ def retry_with_backoff(max_retries: int = 3, backoff_factor: float = 2.0,
     def decorator(func: Callable) -> Callable:
         @functools.wraps(func)
         def wrapper(*args, **kwargs) -> Any:
-            logger = logging.getLogger('folklorovich')
-
             for attempt in range(max_retries):
                 try:
                     return func(*args, **kwargs)
+                except unrecoverable:
+                    raise
                 except exceptions as e:
                     if attempt == max_retries - 1:
                         logger.error(f"{func.__name__} failed after {max_retries} attempts: {e}")
                         raise
 
-                    wait_time = backoff_factor ** attempt
+                    wait_time = min(
+                        max_delay,
+                        backoff_factor ** attempt * (1 + random.uniform(-jitter, jitter))
+                    )
                     logger.warning(
                         f"{func.__name__} failed (attempt {attempt + 1}/{max_retries}): {e}. "
                         f"Retrying in {wait_time:.1f}s..."
@@ -135,45 +320,165 @@ def retry_with_backoff(max_retries: int = 3, backoff_factor: float = 2.0,
     return decorator
 
 
+def _stat_or_none(path: Path) -> Optional[os.stat_result]:
+    """
+    Stat a file in one call, replacing the exists() + stat() pair.
+
+    Args:
+        path: File to stat
+
+    Returns:
+        Stat result, or None if the file does not exist or is unreadable
+    """
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+def _fast_dims(image_path: Path) -> Optional[Tuple[int, int]]:
+    """
+    Read PNG or JPEG dimensions directly from the file header.
+
+    Args:
+        image_path: Path to image file
+
+    Returns:
+        (width, height), or None for other formats and unexpected headers
+    """
+    with open(image_path, 'rb') as f:
+        head = f.read(24)
+        if head[:8] == b'\x89PNG\r\n\x1a\n' and head[12:16] == b'IHDR':
+            return struct.unpack('>II', head[16:24])
+        if head[:2] != b'\xff\xd8':
+            return None
+
+        # Walk JPEG segments until a start-of-frame marker
+        f.seek(2)
+        while True:
+            segment = f.read(4)
+            if len(segment) < 4 or segment[0] != 0xFF:
+                return None
+            marker = segment[1]
+            length = struct.unpack('>H', segment[2:4])[0]
+            if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+                frame = f.read(5)
+                if len(frame) < 5:
+                    return None
+                height, width = struct.unpack('>HH', frame[1:5])
+                return width, height
+            if length < 2:
+                return None
+            f.seek(length - 2, os.SEEK_CUR)
+
+
 def validate_image(image_path: Path, min_width: int = 1080,
-                   min_height: int = 1080) -> bool:
+                   min_height: int = 1080, strict: bool = False) -> bool:
     """
     Validate image quality and dimensions.
 
+    Cheap checks run first (extension, file size, header dimensions); PIL is
+    only used for formats the header parser does not know.
+
     Args:
         image_path: Path to image file
         min_width: Minimum acceptable width
         min_height: Minimum acceptable height
+        strict: Also verify the full file with PIL to detect corruption
 
     Returns:
         True if image is valid, False otherwise
     """
     try:
-        from PIL import Image
-
-        if not image_path.exists():
+        if image_path.suffix.lower() not in IMAGE_EXTENSIONS:
             return False
 
-        # Check file size (should be > 10KB)
-        if image_path.stat().st_size < 10 * 1024:
+        # Check file exists and size (should be > 10KB)
+        stat = _stat_or_none(image_path)
+        if stat is None or stat.st_size < 10 * 1024:
             return False
 
         # Check dimensions
-        with Image.open(image_path) as img:
-            width, height = img.size
-            if width < min_width or height < min_height:
-                return False
+        dims = _fast_dims(image_path)
+        if dims is None:
+            from PIL import Image
+
+            with Image.open(image_path) as img:
+                dims = img.size
+
+        width, height = dims
+        if width < min_width or height < min_height:
+            return False
 
-            # Check if image is corrupted
-            img.verify()
+        # Check if image is corrupted (reads the whole file)
+        if strict:
+            from PIL import Image
+
+            with Image.open(image_path) as img:
+                img.verify()
 
         return True
 
     except Exception as e:
-        logging.getLogger('folklorovich').error(f"Image validation failed: {e}")
+        logger.error(f"Image validation failed: {e}")
         return False
 
 
+@functools.lru_cache(maxsize=256)
+def _probe_media(path: str, mtime_ns: int, size: int) -> Optional[Dict[str, Any]]:
+    """
+    Read the duration and video dimensions of a media file.
+
+    Uses PyAV in-process when it is installed and falls back to ffprobe.
+    Cached per (path, mtime, size), so a rewritten file is probed again.
+
+    Args:
+        path: Path to audio or video file
+        mtime_ns: File modification time (cache key)
+        size: File size in bytes (cache key)
+
+    Returns:
+        Dict with 'duration' (seconds) plus 'width'/'height' when the file
+        has a video stream, or None if the file cannot be probed
+    """
+    if av is not None:
+        try:
+            with av.open(path) as container:
+                if container.duration is None:
+                    return None
+                info = {'duration': container.duration / av.time_base}
+                if container.streams.video:
+                    stream = container.streams.video[0]
+                    info['width'] = stream.width
+                    info['height'] = stream.height
+                return info
+        except av.FFmpegError:
+            return None
+
+    import subprocess
+
+    cmd = [
+        'ffprobe',
+        '-v', 'error',
+        '-select_streams', 'v:0',
+        '-show_entries', 'format=duration:stream=width,height',
+        '-of', 'json',
+        path
+    ]
+
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=PROBE_TIMEOUT)
+    if result.returncode != 0:
+        return None
+
+    probe = serialization.loads(result.stdout)
+    info = {'duration': float(probe['format']['duration'])}
+    streams = probe.get('streams', [])
+    if streams:
+        info['width'] = streams[0].get('width', 0)
+        info['height'] = streams[0].get('height', 0)
+    return info
+
+
 def validate_audio(audio_path: Path, min_duration: float = 10.0,
                    max_duration: float = 45.0) -> bool:
     """
@@ -187,35 +492,20 @@ def validate_audio(audio_path: Path, min_duration: float = 10.0,
     Returns:
         True if audio is valid, False otherwise
     """
-    import subprocess
-
     try:
-        if not audio_path.exists():
+        # Check file exists and size (should be > 5KB)
+        stat = _stat_or_none(audio_path)
+        if stat is None or stat.st_size < 5 * 1024:
             return False
 
-        # Check file size (should be > 5KB)
-        if audio_path.stat().st_size < 5 * 1024:
+        info = _probe_media(str(audio_path), stat.st_mtime_ns, stat.st_size)
+        if info is None:
             return False
 
-        # Get duration using ffprobe
-        cmd = [
-            'ffprobe',
-            '-v', 'error',
-            '-show_entries', 'format=duration',
-            '-of', 'default=noprint_wrappers=1:nokey=1',
-            str(audio_path)
-        ]
-
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-        if result.returncode != 0:
-            return False
-
-        duration = float(result.stdout.strip())
-
-        return min_duration <= duration <= max_duration
+        return min_duration <= info['duration'] <= max_duration
 
     except Exception as e:
-        logging.getLogger('folklorovich').error(f"Audio validation failed: {e}")
+        logger.error(f"Audio validation failed: {e}")
         return False
 
 
@@ -232,140 +522,266 @@ def validate_video(video_path: Path, min_duration: float = 25.0,
     Returns:
         True if video is valid, False otherwise
     """
-    import subprocess
-
     try:
-        if not video_path.exists():
+        # Check file exists and size (should be > 100KB)
+        stat = _stat_or_none(video_path)
+        if stat is None or stat.st_size < 100 * 1024:
             return False
 
-        # Check file size (should be > 100KB)
-        if video_path.stat().st_size < 100 * 1024:
+        info = _probe_media(str(video_path), stat.st_mtime_ns, stat.st_size)
+        if info is None:
             return False
 
-        # Get video info using ffprobe
-        cmd = [
-            'ffprobe',
-            '-v', 'error',
-            '-show_entries', 'format=duration:stream=width,height',
-            '-of', 'json',
-            str(video_path)
-        ]
-
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=15)
-        if result.returncode != 0:
-            return False
-
-        info = json.loads(result.stdout)
-
         # Check duration
-        duration = float(info['format']['duration'])
-        if not (min_duration <= duration <= max_duration):
+        if not (min_duration <= info['duration'] <= max_duration):
             return False
 
         # Check dimensions (should be 1080x1920 or close)
-        streams = info.get('streams', [])
-        if streams:
-            width = streams[0].get('width', 0)
-            height = streams[0].get('height', 0)
-
+        if 'width' in info:
             # Allow some tolerance
-            if not (1000 <= width <= 1200 and 1800 <= height <= 2000):
+            if not (1000 <= info['width'] <= 1200 and 1800 <= info['height'] <= 2000):
                 return False
 
         return True
 
     except Exception as e:
-        logging.getLogger('folklorovich').error(f"Video validation failed: {e}")
+        logger.error(f"Video validation failed: {e}")
         return False
 
 
+# validate_batch asset types
+_VALIDATORS: Dict[str, Callable[[Path], bool]] = {
+    'image': validate_image,
+    'audio': validate_audio,
+    'video': validate_video,
+}
+
+
+def validate_batch(items: List[Tuple[str, Path]]) -> Dict[Path, bool]:
+    """
+    Validate many assets concurrently.
+
+    Each item is dispatched to validate_image, validate_audio or
+    validate_video with default limits. Threads are used because the work is
+    file I/O, PyAV/ffprobe probing and PIL decoding, all of which release
+    the GIL.
+
+    Args:
+        items: (asset type, path) pairs; type is 'image', 'audio' or 'video'
+
+    Returns:
+        Dictionary mapping each path to its validation result
+
+    Raises:
+        ValueError: If an asset type is unknown
+    """
+    for kind, _ in items:
+        if kind not in _VALIDATORS:
+            raise ValueError(f"Unknown asset type: {kind}")
+
+    if not items:
+        return {}
+
+    workers = min(len(items), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(lambda item: _VALIDATORS[item[0]](item[1]), items)
+        return {path: valid for (_, path), valid in zip(items, results)}
+
+
+def _today() -> str:
+    """Local date as YYYY-MM-DD, formatted once per day."""
+    now = time.time()
+    if now >= _day_cache['until']:
+        today = datetime.fromtimestamp(now)
+        midnight = datetime.combine(today.date() + timedelta(days=1), datetime.min.time())
+        _day_cache.update(day=today.strftime('%Y-%m-%d'), until=midnight.timestamp())
+    return _day_cache['day']
+
+
+def _usage_entry(usage_data: Dict[str, Any], api_name: str) -> Dict[str, Any]:
+    """Counters for one API, created empty if missing."""
+    return usage_data.setdefault(api_name, {
+        'total_requests': 0,
+        'requests_by_day': {},
+        'requests_by_type': {}
+    })
+
+
+def _read_usage() -> Dict[str, Any]:
+    """Usage counters currently saved in USAGE_FILE ({} if none yet)."""
+    try:
+        return serialization.load_path(USAGE_FILE)
+    except FileNotFoundError:
+        return {}
+
+
+def _merge_usage(usage_data: Dict[str, Any], pending: Dict[str, Any]) -> None:
+    """
+    Add this process's unsaved counter increments to saved usage data.
+
+    Args:
+        usage_data: Counters read from USAGE_FILE (updated in place)
+        pending: Increments recorded since the last write
+    """
+    for api_name, delta in pending.items():
+        entry = _usage_entry(usage_data, api_name)
+        entry['total_requests'] += delta['total_requests']
+        for field in ('requests_by_day', 'requests_by_type'):
+            for key, count in delta[field].items():
+                entry[field][key] = entry[field].get(key, 0) + count
+        if delta.get('last_request', '') > entry.get('last_request', ''):
+            entry['last_request'] = delta['last_request']
+
+
+def _write_usage() -> Dict[str, Any]:
+    """
+    Merge pending usage increments into USAGE_FILE and write it atomically.
+
+    The file is re-read under an exclusive lock (where fcntl is available),
+    so concurrent processes add to each other's counts instead of
+    overwriting them. Callers must hold _usage_lock.
+
+    Returns:
+        The merged usage data as written
+    """
+    USAGE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(USAGE_FILE.with_name(USAGE_FILE.name + '.lock'), 'a') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+        usage_data = _read_usage()
+        _merge_usage(usage_data, _usage_state['pending'])
+
+        tmp_file = USAGE_FILE.with_name(f"{USAGE_FILE.name}.{os.getpid()}.tmp")
+        with open(tmp_file, 'wb') as f:
+            f.write(serialization.dumps(usage_data))
+        os.replace(tmp_file, USAGE_FILE)
+
+    _usage_state['pending'] = {}
+    _usage_state['dirty'] = 0
+    _usage_state['last_flush'] = time.monotonic()
+    return usage_data
+
+
+def _flush_usage() -> None:
+    """Write pending API usage updates to disk (registered with atexit)."""
+    with _usage_lock:
+        if not _usage_state['dirty']:
+            return
+        try:
+            _write_usage()
+        except Exception as e:
+            logger.warning(f"Could not save API usage: {e}")
+
+
 def track_api_usage(api_name: str, request_type: str = 'general') -> None:
     """
     Track API usage for cost monitoring.
 
+    Increments are kept in memory. The first update is saved to
+    logs/api_usage.json right away; after that they are merged into the file
+    every USAGE_FLUSH_EVERY updates, after USAGE_FLUSH_INTERVAL seconds, and
+    at interpreter exit.
+
     Args:
         api_name: Name of API (e.g., 'unsplash', 'edge_tts')
         request_type: Type of request for detailed tracking
     """
-    usage_file = PROJECT_ROOT / 'logs' / 'api_usage.json'
-
     try:
-        # Load existing usage data
-        if usage_file.exists():
-            with open(usage_file, 'r') as f:
-                usage_data = json.load(f)
-        else:
-            usage_data = {}
-
-        # Initialize API tracking if needed
-        if api_name not in usage_data:
-            usage_data[api_name] = {
-                'total_requests': 0,
-                'requests_by_day': {},
-                'requests_by_type': {}
-            }
-
-        # Update counters
-        today = datetime.now().strftime('%Y-%m-%d')
-        usage_data[api_name]['total_requests'] += 1
-        usage_data[api_name]['requests_by_day'][today] = \
-            usage_data[api_name]['requests_by_day'].get(today, 0) + 1
-        usage_data[api_name]['requests_by_type'][request_type] = \
-            usage_data[api_name]['requests_by_type'].get(request_type, 0) + 1
-        usage_data[api_name]['last_request'] = datetime.now().isoformat()
-
-        # Save updated data
-        usage_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(usage_file, 'w') as f:
-            json.dump(usage_data, f, indent=2)
+        with _usage_lock:
+            entry = _usage_entry(_usage_state['pending'], api_name)
+
+            # Update counters
+            today = _today()
+            entry['total_requests'] += 1
+            entry['requests_by_day'][today] = entry['requests_by_day'].get(today, 0) + 1
+            entry['requests_by_type'][request_type] = \
+                entry['requests_by_type'].get(request_type, 0) + 1
+            entry['last_request'] = datetime.now().isoformat()
+
+            # Save in batches
+            _usage_state['dirty'] += 1
+            if (_usage_state['dirty'] >= USAGE_FLUSH_EVERY or
+                    time.monotonic() - _usage_state['last_flush'] > USAGE_FLUSH_INTERVAL):
+                _write_usage()
 
     except Exception as e:
-        logging.getLogger('folklorovich').warning(f"Could not track API usage: {e}")
+        logger.warning(f"Could not track API usage: {e}")
+
+
+def _walk_size(root: str) -> int:
+    """
+    Total size in bytes of all regular files below a directory.
+
+    Walks iteratively with os.scandir; file type and size come from the
+    directory listing instead of separate stat() calls per entry, and
+    symlinks are not followed.
+
+    Args:
+        root: Directory to measure
+
+    Returns:
+        Size in bytes (0 if the directory does not exist)
+    """
+    total = 0
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        total += entry.stat(follow_symlinks=False).st_size
+        except FileNotFoundError:
+            continue
+    return total
 
 
 def check_storage_usage() -> Dict[str, Any]:
     """
     Check disk usage of output directories.
 
+    Results are reused for STORAGE_CACHE_TTL seconds. Concurrent callers
+    wait for a single walk instead of each measuring the tree.
+
     Returns:
         Dictionary with storage statistics
     """
     import shutil
 
-    stats = {
-        'total_size_mb': 0,
-        'images_size_mb': 0,
-        'audio_size_mb': 0,
-        'videos_size_mb': 0,
-        'timestamp': datetime.now().isoformat()
-    }
+    with _storage_lock:
+        cached = _storage_cache['val']
+        if cached is not None and time.monotonic() - _storage_cache['ts'] < STORAGE_CACHE_TTL:
+            return dict(cached)
+
+        stats = {
+            'total_size_mb': 0,
+            'images_size_mb': 0,
+            'audio_size_mb': 0,
+            'videos_size_mb': 0,
+            'timestamp': datetime.now().isoformat()
+        }
+
+        try:
+            for subdir in STORAGE_DIRS:
+                size = _walk_size(str(OUTPUT_DIR / subdir))
+                stats[f'{subdir}_size_mb'] = round(size / (1024 * 1024), 2)
+            stats['total_size_mb'] = round(
+                stats['images_size_mb'] + stats['audio_size_mb'] + stats['videos_size_mb'],
+                2
+            )
 
-    try:
-        def get_dir_size(path: Path) -> float:
-            """Get directory size in MB"""
-            total = 0
-            if path.exists():
-                for item in path.rglob('*'):
-                    if item.is_file():
-                        total += item.stat().st_size
-            return total / (1024 * 1024)
-
-        stats['images_size_mb'] = round(get_dir_size(OUTPUT_DIR / 'images'), 2)
-        stats['audio_size_mb'] = round(get_dir_size(OUTPUT_DIR / 'audio'), 2)
-        stats['videos_size_mb'] = round(get_dir_size(OUTPUT_DIR / 'videos'), 2)
-        stats['total_size_mb'] = round(
-            stats['images_size_mb'] + stats['audio_size_mb'] + stats['videos_size_mb'],
-            2
-        )
-
-        # Get available disk space
-        disk_usage = shutil.disk_usage(OUTPUT_DIR)
-        stats['available_gb'] = round(disk_usage.free / (1024**3), 2)
+            # Get available disk space
+            disk_usage = shutil.disk_usage(OUTPUT_DIR)
+            stats['available_gb'] = round(disk_usage.free / (1024**3), 2)
 
-    except Exception as e:
-        logging.getLogger('folklorovich').warning(f"Could not check storage: {e}")
+        except Exception as e:
+            logger.warning(f"Could not check storage: {e}")
+            return stats
 
-    return stats
+        _storage_cache.update(ts=time.monotonic(), val=stats)
+        return dict(stats)
 
 
 def alert_if_limits_approaching() -> None:
@@ -376,25 +792,20 @@ def alert_if_limits_approaching() -> None:
     - Unsplash API: 50 requests/hour
     - Storage: Warn if > 1GB used
     """
-    logger = logging.getLogger('folklorovich')
-    usage_file = PROJECT_ROOT / 'logs' / 'api_usage.json'
-
     try:
-        # Check API usage
-        if usage_file.exists():
-            with open(usage_file, 'r') as f:
-                usage_data = json.load(f)
-
-            # Check Unsplash (50 req/hour limit)
-            if 'unsplash' in usage_data:
-                today = datetime.now().strftime('%Y-%m-%d')
-                today_requests = usage_data['unsplash']['requests_by_day'].get(today, 0)
-
-                if today_requests > 40:
-                    logger.warning(
-                        f"⚠️  Unsplash API usage high today: {today_requests}/50 requests. "
-                        "Approaching free tier limit!"
-                    )
+        # Check API usage (saved totals from every process, plus ours)
+        with _usage_lock:
+            usage_data = _write_usage() if _usage_state['dirty'] else _read_usage()
+            unsplash = usage_data.get('unsplash')
+            today = _today()
+            today_requests = unsplash['requests_by_day'].get(today, 0) if unsplash else 0
+
+        # Check Unsplash (50 req/hour limit)
+        if today_requests > 40:
+            logger.warning(
+                f"⚠️  Unsplash API usage high today: {today_requests}/50 requests. "
+                "Approaching free tier limit!"
+            )
 
         # Check storage
         storage = check_storage_usage()
@@ -470,8 +881,6 @@ def safe_file_operation(operation: Callable, *args, **kwargs) -> Optional[Any]:
     Returns:
         Result of operation or None if failed
     """
-    logger = logging.getLogger('folklorovich')
-
     try:
         return operation(*args, **kwargs)
     except PermissionError as e:
@@ -486,5 +895,10 @@ def safe_file_operation(operation: Callable, *args, **kwargs) -> Optional[Any]:
     return None
 
 
-# Initialize logging when module is imported
+# Initialize logging when module is imported; functions above log through
+# this module-level logger instead of looking it up on every call
 logger = setup_logging()
+
+# Registered after setup_logging: atexit runs handlers in reverse order, so the
+# final usage flush (and any warning it logs) happens before logging shuts down
+atexit.register(_flush_usage)